@@ -1,29 +1,81 @@
-import json
+import asyncio
+import functools
+import hashlib
+import io
 import logging
-import os
-import tempfile
-
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from importlib.metadata import PackageNotFoundError, version
+from typing import Callable, TypeVar
+
+import httpx
 import json_repair
+import orjson
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
-from tenacity import retry, stop_after_attempt, wait_exponential
+from pydantic import BaseModel, ValidationError
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 from app.extraction.models import (
+    QUOTE_LIST_ADAPTER,
     InsuranceQuote,
     MultiQuoteExtractionResult,
     MultiQuoteResponse,
     QuoteExtractionResult,
 )
 from app.extraction.pdf_parser import extract_text_from_pdf
-from app.utils.config import GEMINI_API_KEY
+from app.extraction.result_store import ExtractionStore, open_extraction_store
+from app.utils.config import (
+    EXTRACTION_CACHE_PATH,
+    EXTRACTION_CACHE_TTL_DAYS,
+    GEMINI_API_KEY,
+)
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+ResponseSchema = dict | type[BaseModel]
+
 # ---------------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------------
 
-MODEL_NAME = "gemini-2.5-flash"
+# Digital PDFs arrive as clean markdown, where extraction is mostly keyed
+# field lookup — the lite model handles it at lower cost and latency.
+# Scanned PDFs need the full model's vision; it is also the quality
+# fallback when the lite model's output fails to parse or validate.
+TEXT_MODEL_NAME = "gemini-2.5-flash-lite"
+MULTIMODAL_MODEL_NAME = "gemini-2.5-flash"
+
+# First google-genai release that accepts Pydantic classes with field
+# defaults as response_schema; older installs use cleaned dict schemas
+MODEL_SCHEMA_MIN_SDK_VERSION = (1, 10)
+
+# Extraction is schema-constrained at temperature=0 with carrier hints in
+# the prompt, so hidden reasoning adds billed tokens and latency without
+# improving output. The output cap bounds tail latency; the largest
+# multi-quote response (three fully populated quotes) stays well under it.
+THINKING_BUDGET = 0
+MAX_OUTPUT_TOKENS = 8192
+
+# Gemini caps inline requests at 20 MB total. PDF bytes are base64-encoded
+# (+33%) in the request body, so larger PDFs go through the Files API.
+INLINE_PDF_MAX_BYTES = 14 * 1024 * 1024
+
+# Concurrent extractions for batch calls. Each worker holds one in-flight
+# Gemini request, so keep this under the project's RPM quota.
+MAX_EXTRACTION_WORKERS = 4
+
+# Extraction results kept in memory for re-uploads of identical PDFs
+EXTRACTION_CACHE_SIZE = 256
 
 client = genai.Client(api_key=GEMINI_API_KEY)
 
@@ -32,7 +84,7 @@ You are an expert insurance document analyst. Your job is to extract structured
 
 RULES:
 1. Extract ONLY information explicitly stated in the document. Never guess or infer values.
-2. If a field is not present in the document, return null for that field.
+2. If a field is not present in the document, omit it from the output — omitted fields are read as null. In coverage_limits, include only the coverages the document actually lists.
 3. For dollar amounts, extract the numeric value only (no $ signs, no commas). Example: "$1,234.56" → 1234.56
 4. For dates, use ISO 8601 format: YYYY-MM-DD
 5. For coverage limits, map to standardized field names (see mapping below).
@@ -61,8 +113,8 @@ Use these exact keys in the coverage_limits dictionary:
 
 For any coverage type not in this list, create a descriptive snake_case key.
 
-CARRIER-SPECIFIC HINTS:
-{carrier_hints}"""
+Carrier-specific hints are given at the start of each request, before the document. Follow them where they apply.
+"""
 
 CARRIER_HINTS: dict[str, str] = {
     "erie": """
@@ -171,55 +223,113 @@ Do NOT combine multiple policies into a single quote object.
 Do NOT skip any policy type that is present in the document.
 """
 
+# SYSTEM_PROMPT stays byte-identical on every call; the per-carrier part
+# travels as the first user part instead.
+# Keyed by (carrier_key, is_multi). Multi-quote context keeps the
+# {expected_types} placeholder for per-document substitution.
+_CARRIER_CONTEXT: dict[tuple[str, bool], str] = {}
+for _key, _hints in CARRIER_HINTS.items():
+    _CARRIER_CONTEXT[(_key, False)] = "CARRIER-SPECIFIC HINTS:\n" + _hints
+    _CARRIER_CONTEXT[(_key, True)] = _CARRIER_CONTEXT[(_key, False)] + MULTI_QUOTE_ADDENDUM
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 
+# One alternation over every carrier key, so lookup is a single scan of the
+# name regardless of how many carriers have hints
+_CARRIER_RE = re.compile(
+    "|".join(re.escape(key) for key in CARRIER_HINTS if key != "default"),
+    re.IGNORECASE,
+)
+
+
+def get_carrier_key(carrier_name: str) -> str:
+    """Return the CARRIER_HINTS key matching a carrier name, or "default"."""
+    match = _CARRIER_RE.search(carrier_name)
+    return match.group(0).lower() if match else "default"
+
+
 def get_carrier_hints(carrier_name: str) -> str:
     """Return carrier-specific hints based on detected carrier name."""
-    carrier_lower = carrier_name.lower().strip()
-    for key, hints in CARRIER_HINTS.items():
-        if key in carrier_lower:
-            return hints
-    return CARRIER_HINTS["default"]
+    return CARRIER_HINTS[get_carrier_key(carrier_name)]
+
+
+# JSON-schema keywords Gemini structured output rejects
+_UNSUPPORTED_SCHEMA_KEYS = ("additionalProperties", "examples", "title", "default")
 
 
 def _clean_schema_for_gemini(schema: dict) -> dict:
-    """Remove unsupported properties from schema for Gemini structured output."""
-    for key in ("additionalProperties", "examples", "title", "default"):
-        schema.pop(key, None)
-    for key, value in schema.items():
-        if isinstance(value, dict):
-            _clean_schema_for_gemini(value)
-        elif isinstance(value, list):
-            for item in value:
-                if isinstance(item, dict):
-                    _clean_schema_for_gemini(item)
-    for prop in schema.get("properties", {}).values():
-        if isinstance(prop, dict):
-            _clean_schema_for_gemini(prop)
-    for defn in schema.get("$defs", {}).values():
-        if isinstance(defn, dict):
-            _clean_schema_for_gemini(defn)
+    """Remove unsupported properties from schema for Gemini structured output.
+
+    Walks the schema once with an explicit stack. A "properties" mapping is
+    keyed by field name, so its own keys are left alone — only the field
+    schemas inside it are cleaned.
+    """
+    stack: list[tuple[dict, bool]] = [(schema, False)]
+    seen: set[int] = set()
+    while stack:
+        node, is_field_map = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if not is_field_map:
+            for key in _UNSUPPORTED_SCHEMA_KEYS:
+                node.pop(key, None)
+        for key, value in node.items():
+            if isinstance(value, dict):
+                is_map = not is_field_map and key in ("properties", "$defs")
+                stack.append((value, is_map))
+            elif isinstance(value, list):
+                stack.extend((item, False) for item in value if isinstance(item, dict))
     return schema
 
 
+def _sdk_accepts_model_schemas() -> bool:
+    """True when the installed google-genai can take Pydantic classes as schemas.
+
+    Older releases reject fields with default values, so those builds get
+    the cleaned dict schemas instead.
+    """
+    try:
+        installed = tuple(int(part) for part in version("google-genai").split(".")[:2])
+    except (PackageNotFoundError, ValueError):
+        return False
+    return installed >= MODEL_SCHEMA_MIN_SDK_VERSION
+
+
+# Response schemas, resolved once. With model classes the SDK hands back
+# validated instances in response.parsed, skipping a model_validate per call.
+_QUOTE_SCHEMA: ResponseSchema
+_MULTI_SCHEMA: ResponseSchema
+if _sdk_accepts_model_schemas():
+    _QUOTE_SCHEMA = InsuranceQuote
+    _MULTI_SCHEMA = MultiQuoteResponse
+else:
+    _QUOTE_SCHEMA = _clean_schema_for_gemini(InsuranceQuote.model_json_schema())
+    _MULTI_SCHEMA = _clean_schema_for_gemini(MultiQuoteResponse.model_json_schema())
+
+
 def _parse_response(response_text: str) -> InsuranceQuote:
     """Parse Gemini JSON response into InsuranceQuote, with json-repair fallback."""
+    # Happy path: pydantic parses and validates the JSON in one pass
+    # without building an intermediate dict
     try:
-        data = json.loads(response_text)
-    except json.JSONDecodeError:
-        logger.warning("JSON parse failed, attempting json-repair...")
-        repaired = json_repair.repair_json(response_text)
-        try:
-            data = json.loads(repaired)
-        except json.JSONDecodeError as exc:
-            snippet = response_text[:200]
-            raise ValueError(
-                f"JSON parse failed even after repair. Raw response: {snippet}"
-            ) from exc
+        return InsuranceQuote.model_validate_json(response_text)
+    except ValidationError as exc:
+        if exc.errors()[0]["type"] != "json_invalid":
+            raise
+
+    logger.warning("JSON parse failed, attempting json-repair...")
+    # skip_json_loads: we already know the strict parse failed
+    data = json_repair.loads(response_text, skip_json_loads=True)
+    if not isinstance(data, (dict, list)):
+        snippet = response_text[:200]
+        raise ValueError(
+            f"JSON parse failed even after repair. Raw response: {snippet}"
+        )
 
     return InsuranceQuote.model_validate(data)
 
@@ -227,42 +337,94 @@ def _parse_response(response_text: str) -> InsuranceQuote:
 def _parse_multi_response_text(response_text: str) -> list[InsuranceQuote]:
     """Parse Gemini JSON response into list of InsuranceQuote, with json-repair fallback."""
     try:
-        raw = json.loads(response_text)
-    except json.JSONDecodeError:
+        raw = orjson.loads(response_text)
+    except orjson.JSONDecodeError:
         logger.warning("Multi-quote JSON parse failed, attempting json-repair...")
-        repaired = json_repair.repair_json(response_text)
-        try:
-            raw = json.loads(repaired)
-        except json.JSONDecodeError as exc:
+        raw = json_repair.loads(response_text, skip_json_loads=True)
+        if not isinstance(raw, (dict, list)):
             snippet = response_text[:200]
             raise ValueError(
                 f"Multi-quote JSON parse failed even after repair. Raw: {snippet}"
-            ) from exc
+            )
 
     if isinstance(raw, dict) and "quotes" in raw:
         wrapper = MultiQuoteResponse.model_validate(raw)
         return wrapper.quotes
     elif isinstance(raw, list):
-        return [InsuranceQuote.model_validate(q) for q in raw]
+        return QUOTE_LIST_ADAPTER.validate_python(raw)
     else:
         # Attempt single-quote fallback
         return [InsuranceQuote.model_validate(raw)]
 
 
+def _parse_quote_response(response: object) -> InsuranceQuote:
+    """Extract an InsuranceQuote from a Gemini response object."""
+    # SDK returns a dict when using dict schema; convert to Pydantic model
+    if response.parsed is not None:
+        if isinstance(response.parsed, dict):
+            return InsuranceQuote.model_validate(response.parsed)
+        return response.parsed
+    return _parse_response(response.text)
+
+
 def _parse_multi_response(response: object) -> list[InsuranceQuote]:
     """Extract list of InsuranceQuote from a Gemini response object."""
     if response.parsed is not None:
         data = response.parsed
+        if isinstance(data, MultiQuoteResponse):
+            return data.quotes
         if isinstance(data, dict):
             wrapper = MultiQuoteResponse.model_validate(data)
             return wrapper.quotes
         if isinstance(data, list):
-            return [
-                InsuranceQuote.model_validate(q) if isinstance(q, dict) else q
-                for q in data
-            ]
-    # Fall back to text parsing (handles structured output failures)
-    return _parse_multi_response_text(response.text)
+            return QUOTE_LIST_ADAPTER.validate_python(data)
+
+    # Structured output failed; the text may still be repairable JSON
+    feedback = response.prompt_feedback
+    if not response.text:
+        raise ValueError(
+            f"Gemini returned no multi-quote content (prompt_feedback={feedback})"
+        )
+    logger.warning(
+        "Structured multi-quote output missing, parsing text (prompt_feedback=%s)",
+        feedback,
+    )
+    try:
+        return _parse_multi_response_text(response.text)
+    except ValueError as exc:
+        raise ValueError(f"{exc} (prompt_feedback={feedback})") from exc
+
+
+# Config settings shared by every extraction call; only the system prompt
+# and schema vary per request
+_BASE_CONFIG_KWARGS: dict[str, object] = {
+    "response_mime_type": "application/json",
+    "temperature": 0,
+    "max_output_tokens": MAX_OUTPUT_TOKENS,
+    "thinking_config": types.ThinkingConfig(thinking_budget=THINKING_BUDGET),
+}
+
+
+def _build_config(
+    system_prompt: str, schema: ResponseSchema,
+) -> types.GenerateContentConfig:
+    """Build the structured-output config for one extraction call."""
+    return types.GenerateContentConfig(
+        system_instruction=system_prompt,
+        **_BASE_CONFIG_KWARGS,
+        response_schema=schema,
+    )
+
+
+def _generate_content(
+    contents: object, system_prompt: str, schema: ResponseSchema, model: str,
+) -> types.GenerateContentResponse:
+    """Run one generate_content call with the structured-output config from _build_config."""
+    return client.models.generate_content(
+        model=model,
+        contents=contents,
+        config=_build_config(system_prompt, schema),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -270,84 +432,83 @@ def _parse_multi_response(response: object) -> list[InsuranceQuote]:
 # ---------------------------------------------------------------------------
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _call_gemini_text(text: str, system_prompt: str) -> InsuranceQuote:
-    """Send extracted markdown text to Gemini for structured extraction."""
-    clean_schema = _clean_schema_for_gemini(InsuranceQuote.model_json_schema())
-    config = types.GenerateContentConfig(
-        system_instruction=system_prompt,
-        response_mime_type="application/json",
-        response_schema=clean_schema,
-        temperature=0,
-    )
+def _is_transient_error(exc: BaseException) -> bool:
+    """True for errors worth retrying: rate limits, 5xx, and network failures.
+
+    Schema/JSON failures are deterministic at temperature=0, so retrying
+    them only adds latency.
+    """
+    if isinstance(exc, genai_errors.ServerError):
+        return True
+    if isinstance(exc, genai_errors.ClientError):
+        return exc.code in (408, 429)
+    return isinstance(exc, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+# Jittered so concurrent batch workers don't retry in lockstep. reraise
+# surfaces the last API error to extract_and_validate instead of RetryError.
+_gemini_retry = retry(
+    retry=retry_if_exception(_is_transient_error),
+    stop=stop_after_attempt(5),
+    wait=wait_exponential_jitter(initial=1, max=60, jitter=2),
+    reraise=True,
+)
+
+
+@_gemini_retry
+def _pdf_part(pdf_bytes: bytes) -> types.Part:
+    """Build the PDF content part: inline bytes when small, Files API otherwise."""
+    if len(pdf_bytes) <= INLINE_PDF_MAX_BYTES:
+        return types.Part.from_bytes(data=pdf_bytes, mime_type="application/pdf")
 
-    response = client.models.generate_content(
-        model=MODEL_NAME,
-        contents=f"Extract the insurance quote data from this document:\n\n{text}",
-        config=config,
+    uploaded_file = client.files.upload(
+        file=io.BytesIO(pdf_bytes),
+        config=types.UploadFileConfig(mime_type="application/pdf"),
+    )
+    return types.Part(
+        file_data=types.FileData(
+            file_uri=uploaded_file.uri,
+            mime_type="application/pdf",
+        )
     )
 
-    # SDK returns a dict when using dict schema; convert to Pydantic model
-    if response.parsed is not None:
-        if isinstance(response.parsed, dict):
-            return InsuranceQuote.model_validate(response.parsed)
-        return response.parsed
-    return _parse_response(response.text)
 
+@_gemini_retry
+def _call_gemini(
+    contents: list,
+    schema: ResponseSchema,
+    parser: Callable[[object], T],
+    model: str,
+) -> T:
+    """Run one structured-output request and parse it with ``parser``."""
+    return parser(_generate_content(contents, SYSTEM_PROMPT, schema, model))
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _call_gemini_multimodal(pdf_bytes: bytes, system_prompt: str) -> InsuranceQuote:
-    """Send raw PDF to Gemini for multimodal extraction (scanned docs)."""
-    clean_schema = _clean_schema_for_gemini(InsuranceQuote.model_json_schema())
-    config = types.GenerateContentConfig(
-        system_instruction=system_prompt,
-        response_mime_type="application/json",
-        response_schema=clean_schema,
-        temperature=0,
+
+def _call_gemini_text(
+    text: str, carrier_context: str, model: str = TEXT_MODEL_NAME,
+) -> InsuranceQuote:
+    """Send extracted markdown text to Gemini for structured extraction."""
+    return _call_gemini(
+        [
+            carrier_context,
+            f"Extract the insurance quote data from this document:\n\n{text}",
+        ],
+        _QUOTE_SCHEMA, _parse_quote_response, model,
     )
 
-    tmp_fd = None
-    tmp_path: str | None = None
-    try:
-        # Use mkstemp to get raw file descriptor (Windows-compatible)
-        # mkstemp returns (fd, path) - we must close fd before Gemini reads file
-        tmp_fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
-        os.write(tmp_fd, pdf_bytes)
-        os.close(tmp_fd)  # Close file descriptor immediately
-        tmp_fd = None  # Mark as closed
-
-        uploaded_file = client.files.upload(file=tmp_path)
-
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=[
-                "Extract the insurance quote data from this PDF document.",
-                types.Part(
-                    file_data=types.FileData(
-                        file_uri=uploaded_file.uri,
-                        mime_type="application/pdf",
-                    )
-                ),
-            ],
-            config=config,
-        )
-    finally:
-        # Clean up file descriptor if still open
-        if tmp_fd is not None:
-            try:
-                os.close(tmp_fd)
-            except OSError:
-                pass
-        # Clean up temp file
-        if tmp_path and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
 
-    # SDK returns a dict when using dict schema; convert to Pydantic model
-    if response.parsed is not None:
-        if isinstance(response.parsed, dict):
-            return InsuranceQuote.model_validate(response.parsed)
-        return response.parsed
-    return _parse_response(response.text)
+def _call_gemini_multimodal(
+    pdf_bytes: bytes, carrier_context: str, model: str = MULTIMODAL_MODEL_NAME,
+) -> InsuranceQuote:
+    """Send raw PDF to Gemini for multimodal extraction (scanned docs)."""
+    return _call_gemini(
+        [
+            carrier_context,
+            "Extract the insurance quote data from this PDF document.",
+            _pdf_part(pdf_bytes),
+        ],
+        _QUOTE_SCHEMA, _parse_quote_response, model,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -355,80 +516,179 @@ def _call_gemini_multimodal(pdf_bytes: bytes, system_prompt: str) -> InsuranceQu
 # ---------------------------------------------------------------------------
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _call_gemini_text_multi(text: str, system_prompt: str) -> list[InsuranceQuote]:
+def _call_gemini_text_multi(
+    text: str, carrier_context: str, model: str = TEXT_MODEL_NAME,
+) -> list[InsuranceQuote]:
     """Send text to Gemini for multi-quote structured extraction."""
-    clean_schema = _clean_schema_for_gemini(
-        MultiQuoteResponse.model_json_schema()
-    )
-    config = types.GenerateContentConfig(
-        system_instruction=system_prompt,
-        response_mime_type="application/json",
-        response_schema=clean_schema,
-        temperature=0,
-    )
-
-    response = client.models.generate_content(
-        model=MODEL_NAME,
-        contents=(
+    return _call_gemini(
+        [
+            carrier_context,
             "Extract ALL insurance quotes from this document. "
-            "This document contains multiple policy types.\n\n" + text
-        ),
-        config=config,
+            "This document contains multiple policy types.\n\n" + text,
+        ],
+        _MULTI_SCHEMA, _parse_multi_response, model,
     )
 
-    return _parse_multi_response(response)
 
-
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
 def _call_gemini_multimodal_multi(
-    pdf_bytes: bytes, system_prompt: str
+    pdf_bytes: bytes, carrier_context: str, model: str = MULTIMODAL_MODEL_NAME,
 ) -> list[InsuranceQuote]:
     """Send raw PDF to Gemini for multi-quote multimodal extraction."""
-    clean_schema = _clean_schema_for_gemini(
-        MultiQuoteResponse.model_json_schema()
-    )
-    config = types.GenerateContentConfig(
-        system_instruction=system_prompt,
-        response_mime_type="application/json",
-        response_schema=clean_schema,
-        temperature=0,
+    return _call_gemini(
+        [
+            carrier_context,
+            "Extract ALL insurance quotes from this PDF document. "
+            "This document contains multiple policy types.",
+            _pdf_part(pdf_bytes),
+        ],
+        _MULTI_SCHEMA, _parse_multi_response, model,
     )
 
-    tmp_fd = None
-    tmp_path: str | None = None
+
+# ---------------------------------------------------------------------------
+# Extraction result cache
+# ---------------------------------------------------------------------------
+
+_ExtractionCacheKey = tuple[bytes, str, tuple[str, ...], bool]
+
+# LRU of extraction results; values are never handed out, only copies
+_extraction_cache: OrderedDict[
+    _ExtractionCacheKey, InsuranceQuote | list[InsuranceQuote]
+] = OrderedDict()
+_extraction_cache_lock = threading.Lock()
+
+
+def _extraction_cache_key(
+    pdf_bytes: bytes,
+    carrier_name: str,
+    expected_policy_types: list[str] | None,
+    is_multi: bool,
+) -> _ExtractionCacheKey:
+    """Key on PDF content plus everything that changes the prompt."""
+    digest = hashlib.blake2b(pdf_bytes, digest_size=16).digest()
+    return digest, carrier_name, tuple(expected_policy_types or ()), is_multi
+
+
+def _extraction_cache_get(
+    key: _ExtractionCacheKey,
+) -> InsuranceQuote | list[InsuranceQuote] | None:
+    with _extraction_cache_lock:
+        value = _extraction_cache.get(key)
+        if value is not None:
+            _extraction_cache.move_to_end(key)
+        return value
+
+
+def _extraction_cache_put(
+    key: _ExtractionCacheKey, value: InsuranceQuote | list[InsuranceQuote],
+) -> None:
+    with _extraction_cache_lock:
+        _extraction_cache[key] = value
+        _extraction_cache.move_to_end(key)
+        if len(_extraction_cache) > EXTRACTION_CACHE_SIZE:
+            _extraction_cache.popitem(last=False)
+
+
+# Fingerprint of everything besides the PDF that shapes extraction output.
+# Persisted results from an older prompt, schema, or model read as misses.
+PROMPT_VERSION = hashlib.blake2b(
+    "\x00".join([
+        SYSTEM_PROMPT,
+        *_CARRIER_CONTEXT.values(),
+        orjson.dumps(InsuranceQuote.model_json_schema()).decode(),
+        TEXT_MODEL_NAME,
+        MULTIMODAL_MODEL_NAME,
+    ]).encode(),
+    digest_size=8,
+).hexdigest()
+
+# Optional second tier that survives restarts; see EXTRACTION_CACHE_PATH
+_result_store: ExtractionStore | None = (
+    open_extraction_store(EXTRACTION_CACHE_PATH, EXTRACTION_CACHE_TTL_DAYS * 86400)
+    if EXTRACTION_CACHE_PATH
+    else None
+)
+
+
+def _stored_key(key: _ExtractionCacheKey) -> str:
+    digest, carrier_name, expected_types, is_multi = key
+    return "|".join([
+        digest.hex(), carrier_name, ",".join(expected_types),
+        "multi" if is_multi else "single", PROMPT_VERSION,
+    ])
+
+
+def _load_stored_result(
+    key: _ExtractionCacheKey,
+) -> InsuranceQuote | list[InsuranceQuote] | None:
+    """Read a result from the persistent store into the in-memory LRU."""
+    if _result_store is None:
+        return None
+    raw = _result_store.get(_stored_key(key))
+    if raw is None:
+        return None
+    is_multi = key[3]
     try:
-        tmp_fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
-        os.write(tmp_fd, pdf_bytes)
-        os.close(tmp_fd)
-        tmp_fd = None
-
-        uploaded_file = client.files.upload(file=tmp_path)
-
-        response = client.models.generate_content(
-            model=MODEL_NAME,
-            contents=[
-                "Extract ALL insurance quotes from this PDF document. "
-                "This document contains multiple policy types.",
-                types.Part(
-                    file_data=types.FileData(
-                        file_uri=uploaded_file.uri,
-                        mime_type="application/pdf",
-                    )
-                ),
-            ],
-            config=config,
-        )
-    finally:
-        if tmp_fd is not None:
-            try:
-                os.close(tmp_fd)
-            except OSError:
-                pass
-        if tmp_path and os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+        if is_multi:
+            value = QUOTE_LIST_ADAPTER.validate_json(raw)
+        else:
+            value = InsuranceQuote.model_validate_json(raw)
+    except ValueError as exc:
+        logger.warning("Discarding unreadable stored extraction: %s", exc)
+        return None
+    _extraction_cache_put(key, value)
+    return value
+
+
+def _save_stored_result(
+    key: _ExtractionCacheKey, value: InsuranceQuote | list[InsuranceQuote],
+) -> None:
+    if _result_store is None:
+        return
+    if isinstance(value, list):
+        raw = QUOTE_LIST_ADAPTER.dump_json(value).decode()
+    else:
+        raw = value.model_dump_json()
+    _result_store.put(_stored_key(key), raw)
+
+
+def clear_extraction_cache() -> None:
+    """Drop all cached extraction results, in memory and persisted."""
+    with _extraction_cache_lock:
+        _extraction_cache.clear()
+    if _result_store is not None:
+        _result_store.clear()
+
+
+# Extractions currently running, so concurrent identical requests (e.g. a
+# double-clicked Extract) wait for one Gemini call instead of making two
+_inflight: dict[_ExtractionCacheKey, Future] = {}
+_inflight_lock = threading.Lock()
+
 
-    return _parse_multi_response(response)
+def _single_flight(key: _ExtractionCacheKey, fn: Callable[[], T]) -> T:
+    """Run fn once per key at a time; concurrent callers share its outcome."""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _inflight[key] = future
+
+    if not is_owner:
+        return future.result()
+
+    try:
+        result = fn()
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
 
 
 # ---------------------------------------------------------------------------
@@ -436,31 +696,73 @@ def _call_gemini_multimodal_multi(
 # ---------------------------------------------------------------------------
 
 
+@functools.lru_cache(maxsize=64)
+def _format_policy_types(policy_types: tuple[str, ...]) -> str:
+    """Render policy types for prompts and warnings, e.g. "Home, Umbrella"."""
+    return ", ".join(t.title() for t in policy_types)
+
+
 def extract_quote_data(
     pdf_bytes: bytes, filename: str = "", carrier_name: str = "",
 ) -> InsuranceQuote:
     """Extract structured quote data from PDF bytes via Gemini.
 
     Uses text path for digital PDFs, multimodal path for scanned PDFs.
-    Retries up to 3 times with exponential backoff on API errors.
+    Transient API errors are retried up to 5 attempts with jittered
+    exponential backoff.
 
     Args:
         pdf_bytes: Raw PDF file bytes.
         filename: Original filename for logging.
         carrier_name: Optional carrier name for carrier-specific hints.
     """
+    cache_key = _extraction_cache_key(pdf_bytes, carrier_name, None, False)
+    cached = _extraction_cache_get(cache_key)
+    if cached is not None:
+        logger.info("Extraction cache hit for %s", filename or "unknown")
+        return cached.model_copy(deep=True)
+
+    quote = _single_flight(
+        cache_key,
+        lambda: _extract_quote(pdf_bytes, filename, carrier_name, cache_key),
+    )
+    return quote.model_copy(deep=True)
+
+
+def _extract_quote(
+    pdf_bytes: bytes,
+    filename: str,
+    carrier_name: str,
+    cache_key: _ExtractionCacheKey,
+) -> InsuranceQuote:
+    """Run a single-quote extraction and cache it; returns the cached instance."""
+    # A concurrent caller may have finished between our cache check and
+    # taking ownership of the in-flight slot
+    cached = _extraction_cache_get(cache_key)
+    if cached is None:
+        cached = _load_stored_result(cache_key)
+    if cached is not None:
+        return cached
+
     text, is_digital = extract_text_from_pdf(pdf_bytes)
 
-    hints = get_carrier_hints(carrier_name) if carrier_name else CARRIER_HINTS["default"]
-    system_prompt = SYSTEM_PROMPT.replace("{carrier_hints}", hints)
+    carrier_key = get_carrier_key(carrier_name) if carrier_name else "default"
+    carrier_context = _CARRIER_CONTEXT[(carrier_key, False)]
 
     if is_digital and text:
         logger.info("Using text extraction path for %s", filename or "unknown")
-        quote = _call_gemini_text(text, system_prompt)
+        try:
+            quote = _call_gemini_text(text, carrier_context)
+        except ValueError as exc:  # includes pydantic ValidationError
+            logger.warning(
+                "%s output unusable for %s, retrying with %s: %s",
+                TEXT_MODEL_NAME, filename or "unknown", MULTIMODAL_MODEL_NAME, exc,
+            )
+            quote = _call_gemini_text(text, carrier_context, MULTIMODAL_MODEL_NAME)
         raw_source = "text"
     else:
         logger.warning("Using multimodal extraction path for %s", filename or "unknown")
-        quote = _call_gemini_multimodal(pdf_bytes, system_prompt)
+        quote = _call_gemini_multimodal(pdf_bytes, carrier_context)
         raw_source = "multimodal"
 
     quote = quote.model_copy(update={"raw_source": raw_source})
@@ -469,6 +771,8 @@ def extract_quote_data(
         "Extraction complete: carrier=%s, confidence=%s, path=%s, file=%s",
         quote.carrier_name, quote.confidence, raw_source, filename,
     )
+    _extraction_cache_put(cache_key, quote)
+    _save_stored_result(cache_key, quote)
     return quote
 
 
@@ -489,28 +793,77 @@ def extract_multi_quote_data(
     Returns:
         List of InsuranceQuote objects, one per policy type found.
     """
+    # One expected policy needs no array wrapper; the single-quote schema
+    # is smaller and produces fewer output tokens
+    if expected_policy_types is None or len(expected_policy_types) <= 1:
+        return [extract_quote_data(pdf_bytes, filename, carrier_name)]
+
+    cache_key = _extraction_cache_key(
+        pdf_bytes, carrier_name, expected_policy_types, True,
+    )
+    cached = _extraction_cache_get(cache_key)
+    if cached is not None:
+        logger.info("Multi-extraction cache hit for %s", filename or "unknown")
+        return [q.model_copy(deep=True) for q in cached]
+
+    quotes = _single_flight(
+        cache_key,
+        lambda: _extract_multi_quote(
+            pdf_bytes, filename, carrier_name, expected_policy_types, cache_key,
+        ),
+    )
+    return [q.model_copy(deep=True) for q in quotes]
+
+
+def _extract_multi_quote(
+    pdf_bytes: bytes,
+    filename: str,
+    carrier_name: str,
+    expected_policy_types: list[str],
+    cache_key: _ExtractionCacheKey,
+) -> list[InsuranceQuote]:
+    """Run a multi-quote extraction and cache it; returns the cached list."""
+    cached = _extraction_cache_get(cache_key)
+    if cached is None:
+        cached = _load_stored_result(cache_key)
+    if cached is not None:
+        return cached
+
     text, is_digital = extract_text_from_pdf(pdf_bytes)
 
-    hints = get_carrier_hints(carrier_name) if carrier_name else CARRIER_HINTS["default"]
-    expected_str = ", ".join(t.title() for t in (expected_policy_types or []))
-    addendum = MULTI_QUOTE_ADDENDUM.replace("{expected_types}", expected_str)
-    system_prompt = SYSTEM_PROMPT.replace("{carrier_hints}", hints) + addendum
+    carrier_key = get_carrier_key(carrier_name) if carrier_name else "default"
+    expected_str = _format_policy_types(tuple(expected_policy_types))
+    carrier_context = _CARRIER_CONTEXT[(carrier_key, True)].replace(
+        "{expected_types}", expected_str
+    )
 
     if is_digital and text:
         logger.info("Multi-quote text extraction for %s", filename or "unknown")
-        quotes = _call_gemini_text_multi(text, system_prompt)
+        try:
+            quotes = _call_gemini_text_multi(text, carrier_context)
+        except ValueError as exc:  # includes pydantic ValidationError
+            logger.warning(
+                "%s output unusable for %s, retrying with %s: %s",
+                TEXT_MODEL_NAME, filename or "unknown", MULTIMODAL_MODEL_NAME, exc,
+            )
+            quotes = _call_gemini_text_multi(
+                text, carrier_context, MULTIMODAL_MODEL_NAME,
+            )
         raw_source = "text"
     else:
         logger.info("Multi-quote multimodal extraction for %s", filename or "unknown")
-        quotes = _call_gemini_multimodal_multi(pdf_bytes, system_prompt)
+        quotes = _call_gemini_multimodal_multi(pdf_bytes, carrier_context)
         raw_source = "multimodal"
 
+    # Models are frozen; model_copy is a shallow copy and does not re-validate
     quotes = [q.model_copy(update={"raw_source": raw_source}) for q in quotes]
 
     logger.info(
         "Multi-extraction complete: %d quotes from %s (carrier=%s)",
         len(quotes), filename or "unknown", carrier_name,
     )
+    _extraction_cache_put(cache_key, quotes)
+    _save_stored_result(cache_key, quotes)
     return quotes
 
 
@@ -573,7 +926,7 @@ def extract_and_validate_multi(
         if expected_policy_types and len(quotes) < len(expected_policy_types):
             all_warnings.append(
                 f"Expected {len(expected_policy_types)} policy types "
-                f"({', '.join(t.title() for t in expected_policy_types)}) "
+                f"({_format_policy_types(tuple(expected_policy_types))}) "
                 f"but only extracted {len(quotes)} from the combined PDF. "
                 f"You may need to enter missing data manually in the review stage."
             )
@@ -596,3 +949,56 @@ def extract_and_validate_multi(
             success=False,
             error=str(exc),
         )
+
+
+def extract_and_validate_batch(
+    items: list[tuple[bytes, str, str]],
+    max_workers: int = MAX_EXTRACTION_WORKERS,
+) -> list[QuoteExtractionResult]:
+    """Run extract_and_validate over many PDFs concurrently.
+
+    Extraction is dominated by Gemini network wait, so a small thread pool
+    overlaps the round-trips. Results are returned in input order.
+
+    Args:
+        items: (pdf_bytes, filename, carrier_name) tuples.
+        max_workers: Concurrent Gemini requests; raise only if RPM quota allows.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda item: extract_and_validate(*item), items))
+
+
+def extract_and_validate_multi_batch(
+    items: list[tuple[bytes, str, str, list[str] | None]],
+    max_workers: int = MAX_EXTRACTION_WORKERS,
+) -> list[MultiQuoteExtractionResult]:
+    """Run extract_and_validate_multi over many combined PDFs concurrently.
+
+    Args:
+        items: (pdf_bytes, filename, carrier_name, expected_policy_types) tuples.
+        max_workers: Concurrent Gemini requests; raise only if RPM quota allows.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda item: extract_and_validate_multi(*item), items))
+
+
+async def extract_and_validate_many(
+    items: list[tuple[bytes, str, str]],
+    max_concurrency: int = MAX_EXTRACTION_WORKERS,
+) -> list[QuoteExtractionResult]:
+    """Async counterpart of extract_and_validate_batch for event-loop callers.
+
+    Each extraction runs in a worker thread, with at most max_concurrency
+    in flight. Results are returned in input order.
+
+    Args:
+        items: (pdf_bytes, filename, carrier_name) tuples.
+        max_concurrency: Concurrent Gemini requests; raise only if RPM quota allows.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(item: tuple[bytes, str, str]) -> QuoteExtractionResult:
+        async with semaphore:
+            return await asyncio.to_thread(extract_and_validate, *item)
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
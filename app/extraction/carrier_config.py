@@ -1,5 +1,6 @@
 """Carrier-specific configuration for combined PDF handling."""
 
+import re
 from typing import Optional
 
 
@@ -34,46 +35,73 @@ def is_combined_carrier(carrier_name: str) -> bool:
     return get_combined_sections(carrier_name) is not None
 
 
-def classify_policy_type(policy_type: str) -> Optional[str]:
-    """Map an InsuranceQuote.policy_type string to a CarrierBundle section name.
-
-    Uses fuzzy substring matching to handle variations like "Homeowners",
-    "HO-3", "Personal Umbrella", "Excess Liability", "Personal Auto", etc.
-
-    Args:
-        policy_type: Raw policy type from extraction (e.g., "HO3", "Auto", "Umbrella")
-
-    Returns:
-        Section name ("home", "auto", "umbrella") or None if unrecognized
-    """
-    pt = policy_type.lower().strip()
-
+# Policy-type keywords per CarrierBundle section, each compiled into one
+# alternation so classification is a single regex scan per section.
+# Sections are checked in order: home, auto, umbrella.
+_HOME_KEYWORDS: tuple[str, ...] = (
+    "ho3", "ho5", "ho-3", "ho-5", "ho 3", "ho 5",
+    "homeowner", "home owner", "dwelling", "dp3", "dp-3",
+    "houseowner", "house owner",
+)
+_AUTO_KEYWORDS: tuple[str, ...] = (
+    "auto", "car", "vehicle", "personal auto", "pa ",
+    "motor", "automobile",
+)
+_UMBRELLA_KEYWORDS: tuple[str, ...] = (
+    "umbrella", "excess", "pup", "personal umbrella",
+    "excess liability",
+)
+
+_HOME_RE = re.compile("|".join(map(re.escape, _HOME_KEYWORDS)))
+_AUTO_RE = re.compile("|".join(map(re.escape, _AUTO_KEYWORDS)))
+_UMBRELLA_RE = re.compile("|".join(map(re.escape, _UMBRELLA_KEYWORDS)))
+
+
+def _classify_by_keywords(pt: str) -> Optional[str]:
+    """Keyword-scan a lowercased, stripped policy type."""
     # Home policies
-    home_keywords = [
-        "ho3", "ho5", "ho-3", "ho-5", "ho 3", "ho 5",
-        "homeowner", "home owner", "dwelling", "dp3", "dp-3",
-        "houseowner", "house owner",
-    ]
-    if any(kw in pt for kw in home_keywords):
+    if _HOME_RE.search(pt):
         return "home"
     # Catch bare "home" but not "homeowner" (already caught above)
     if "home" in pt and "umbrella" not in pt:
         return "home"
 
     # Auto policies
-    auto_keywords = [
-        "auto", "car", "vehicle", "personal auto", "pa ",
-        "motor", "automobile",
-    ]
-    if any(kw in pt for kw in auto_keywords):
+    if _AUTO_RE.search(pt):
         return "auto"
 
     # Umbrella policies
-    umbrella_keywords = [
-        "umbrella", "excess", "pup", "personal umbrella",
-        "excess liability",
-    ]
-    if any(kw in pt for kw in umbrella_keywords):
+    if _UMBRELLA_RE.search(pt):
         return "umbrella"
 
     return None
+
+
+# Policy types Gemini returns most often, resolved with one dict lookup.
+# Built from the keyword scan itself so the two paths can never disagree.
+_COMMON_POLICY_TYPES: tuple[str, ...] = (
+    "ho3", "ho5", "ho-3", "ho-5", "ho 3", "ho 5", "home", "homeowners",
+    "dp3", "auto", "personal auto", "automobile",
+    "umbrella", "personal umbrella", "pup", "excess liability",
+)
+_EXACT_POLICY_MAP: dict[str, Optional[str]] = {
+    pt: _classify_by_keywords(pt) for pt in _COMMON_POLICY_TYPES
+}
+
+
+def classify_policy_type(policy_type: str) -> Optional[str]:
+    """Map an InsuranceQuote.policy_type string to a CarrierBundle section name.
+
+    Uses fuzzy substring matching to handle variations like "Homeowners",
+    "HO-3", "Personal Umbrella", "Excess Liability", "Personal Auto", etc.
+
+    Args:
+        policy_type: Raw policy type from extraction (e.g., "HO3", "Auto", "Umbrella")
+
+    Returns:
+        Section name ("home", "auto", "umbrella") or None if unrecognized
+    """
+    pt = policy_type.lower().strip()
+    if pt in _EXACT_POLICY_MAP:
+        return _EXACT_POLICY_MAP[pt]
+    return _classify_by_keywords(pt)
@@ -1,5 +1,9 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import (
+    BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, model_validator,
+)
+from typing import Any, Literal, Optional
+
+CONFIDENCE_LEVELS: frozenset[str] = frozenset(["high", "medium", "low"])
 
 
 class CoverageLimits(BaseModel):
@@ -24,6 +28,8 @@ class CoverageLimits(BaseModel):
 
 
 class InsuranceQuote(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     carrier_name: str = Field(description="Insurance carrier name (e.g., 'Erie Insurance', 'State Farm')")
     policy_type: str = Field(description="Policy type code: HO3, HO5, Auto, BOP, etc.")
     effective_date: Optional[str] = Field(None, description="Policy effective date in ISO format YYYY-MM-DD")
@@ -33,20 +39,55 @@ class InsuranceQuote(BaseModel):
     deductible: float = Field(description="Primary deductible in USD")
     wind_hail_deductible: Optional[float] = Field(None, description="Separate wind/hail deductible if applicable")
     coverage_limits: CoverageLimits = Field(default_factory=CoverageLimits, description="Coverage limits by type")
-    endorsements: list[str] = Field(default_factory=list, description="List of endorsements/riders included")
-    exclusions: list[str] = Field(default_factory=list, description="List of notable exclusions")
-    discounts_applied: list[str] = Field(default_factory=list, description="Discounts applied to this quote")
-    confidence: str = Field(description="Extraction confidence: 'high', 'medium', or 'low'")
+    endorsements: tuple[str, ...] = Field((), description="List of endorsements/riders included")
+    exclusions: tuple[str, ...] = Field((), description="List of notable exclusions")
+    discounts_applied: tuple[str, ...] = Field((), description="Discounts applied to this quote")
+    confidence: Literal["high", "medium", "low"] = Field(description="Extraction confidence: 'high', 'medium', or 'low'")
     notes: Optional[str] = Field(None, description="Any caveats, ambiguities, or extraction notes")
     raw_source: Optional[str] = Field(None, description="Which extraction path was used: 'text' or 'multimodal'")
 
+    # The confidence value as extracted, when it wasn't a recognized level
+    _invalid_confidence: Optional[str] = PrivateAttr(None)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def default_unknown_confidence(cls, data: Any, handler: Any) -> "InsuranceQuote":
+        """Normalize case and default unrecognized confidence values to 'low'.
+
+        The original value is kept on the instance so validate_quote can
+        warn about the correction instead of it passing silently.
+        """
+        invalid = None
+        if isinstance(data, dict) and "confidence" in data:
+            value = data["confidence"]
+            normalized = value.strip().lower() if isinstance(value, str) else value
+            if normalized not in CONFIDENCE_LEVELS:
+                invalid, normalized = str(value), "low"
+            data = {**data, "confidence": normalized}
+        quote = handler(data)
+        if invalid is not None:
+            quote._invalid_confidence = invalid
+        return quote
+
+    @property
+    def invalid_confidence(self) -> Optional[str]:
+        """The unrecognized confidence value that was defaulted to 'low', if any."""
+        return self._invalid_confidence
+
+
+# Validates a list of quote dicts in one pydantic-core call; prefer this
+# over building InsuranceQuote instances one at a time
+QUOTE_LIST_ADAPTER: TypeAdapter[list[InsuranceQuote]] = TypeAdapter(list[InsuranceQuote])
+
 
 class QuoteExtractionResult(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     filename: str
     success: bool
     quote: Optional[InsuranceQuote] = None
     error: Optional[str] = None
-    warnings: list[str] = Field(default_factory=list)
+    warnings: tuple[str, ...] = ()
 
 
 class MultiQuoteResponse(BaseModel):
@@ -63,11 +104,13 @@ class MultiQuoteExtractionResult(BaseModel):
     success: bool
     quotes: list[InsuranceQuote] = Field(default_factory=list)
     error: Optional[str] = None
-    warnings: list[str] = Field(default_factory=list)
+    warnings: tuple[str, ...] = ()
 
 
 class CarrierBundle(BaseModel):
     """All quotes from a single carrier for one customer comparison."""
+    model_config = ConfigDict(frozen=True)
+
     carrier_name: str = Field(description="Carrier name for column header")
     home: Optional[InsuranceQuote] = Field(None, description="Home/HO3/HO5 quote (Dwelling 1)")
     home_2: Optional[InsuranceQuote] = Field(None, description="Home/HO3/HO5 quote (Dwelling 2)")
@@ -77,32 +120,24 @@ class CarrierBundle(BaseModel):
     @property
     def total_premium(self) -> float:
         """Sum of all policy premiums for this carrier."""
-        total = 0.0
-        if self.home:
-            total += self.home.annual_premium
-        if self.home_2:
-            total += self.home_2.annual_premium
-        if self.auto:
-            total += self.auto.annual_premium
-        if self.umbrella:
-            total += self.umbrella.annual_premium
-        return total
+        quotes = (self.home, self.home_2, self.auto, self.umbrella)
+        return sum((q.annual_premium for q in quotes if q is not None), 0.0)
 
     @property
     def policy_types_present(self) -> list[str]:
         """Which policy types have quotes."""
-        types = []
-        if self.home or self.home_2:
-            types.append("home")
-        if self.auto:
-            types.append("auto")
-        if self.umbrella:
-            types.append("umbrella")
-        return types
+        sections = (
+            ("home", self.home or self.home_2),
+            ("auto", self.auto),
+            ("umbrella", self.umbrella),
+        )
+        return [name for name, quote in sections if quote is not None]
 
 
 class CurrentPolicy(BaseModel):
     """Customer's current coverage for comparison baseline."""
+    model_config = ConfigDict(frozen=True)
+
     carrier_name: str = Field(description="Current carrier name")
 
     # Home (Dwelling 1)
@@ -137,20 +172,17 @@ class CurrentPolicy(BaseModel):
 
     @property
     def total_premium(self) -> float:
-        total = 0.0
-        if self.home_premium:
-            total += self.home_premium
-        if self.home_2_premium:
-            total += self.home_2_premium
-        if self.auto_premium:
-            total += self.auto_premium
-        if self.umbrella_premium:
-            total += self.umbrella_premium
-        return total
+        premiums = (
+            self.home_premium, self.home_2_premium,
+            self.auto_premium, self.umbrella_premium,
+        )
+        return sum((p for p in premiums if p), 0.0)
 
 
 class ComparisonSession(BaseModel):
     """Complete comparison session with all data."""
+    model_config = ConfigDict(frozen=True)
+
     client_name: str
     date: str = Field(description="ISO date YYYY-MM-DD")
     current_policy: Optional[CurrentPolicy] = None
@@ -1,4 +1,7 @@
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 
 import fitz  # pymupdf — used for page count and in-memory open
 import pymupdf4llm
@@ -6,31 +9,82 @@ import pymupdf4llm
 logger = logging.getLogger(__name__)
 
 
+# Average markdown characters per page above which a PDF is treated as
+# digital (machine-generated) rather than a scan
+DIGITAL_CHARS_PER_PAGE = 100
+
+# A sampled page with fewer text-layer characters than this counts as
+# image-only. If every sampled page is, the PDF is a scan and markdown
+# conversion is skipped.
+SCAN_SAMPLE_CHARS = 50
+
+# Options for pymupdf4llm.to_markdown. The extractor only reads text, so skip
+# image rendering; table detection stays on so premium tables keep their rows.
+MARKDOWN_OPTIONS = {"write_images": False, "embed_images": False}
+
+# Parsed results for recently seen PDFs, keyed by SHA-256 of the bytes so
+# the cache doesn't pin the PDFs themselves
+TEXT_CACHE_SIZE = 32
+_text_cache: OrderedDict[bytes, tuple[str, bool]] = OrderedDict()
+_text_cache_lock = threading.Lock()
+
+
+def _looks_scanned(doc: fitz.Document) -> bool:
+    """Sample the first, middle and last pages; True if all have no real text layer."""
+    num_pages = doc.page_count
+    sample_pages = sorted({0, num_pages // 2, num_pages - 1})
+    return all(len(doc[i].get_text()) < SCAN_SAMPLE_CHARS for i in sample_pages)
+
+
+def _parse_pdf(pdf_bytes: bytes) -> tuple[str, bool]:
+    """Probe and convert one PDF; raises on unreadable input."""
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        num_pages = doc.page_count
+        if num_pages == 0 or _looks_scanned(doc):
+            logger.info("PDF parsed: %d pages, sampled pages have no text layer", num_pages)
+            return "", False
+        markdown_text: str = pymupdf4llm.to_markdown(doc, **MARKDOWN_OPTIONS)
+    finally:
+        doc.close()
+
+    is_digital = len(markdown_text) / num_pages > DIGITAL_CHARS_PER_PAGE
+    logger.info(
+        "PDF parsed: %d pages, %d chars, is_digital=%s",
+        num_pages, len(markdown_text), is_digital,
+    )
+    return (markdown_text if is_digital else ""), is_digital
+
+
 def extract_text_from_pdf(pdf_bytes: bytes) -> tuple[str, bool]:
     """Extract markdown text from PDF bytes and determine if the PDF is digital.
 
+    Three sampled pages are probed first; if none has a text layer the PDF
+    is a scan and returns early without the much slower markdown
+    conversion, since the multimodal path never uses its text. Results are
+    cached by content hash, so re-extracting the same PDF (e.g. with a
+    different carrier) skips the parse.
+
     Returns:
         (markdown_text, is_digital) where is_digital is True if average
         chars per page > 100 (indicating machine-generated text, not a scan).
-        On any error, returns ("", False).
+        Scanned PDFs return ("", False). On any error, returns ("", False).
     """
-    try:
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-        markdown_text: str = pymupdf4llm.to_markdown(doc)
-        num_pages = len(doc)
-        doc.close()
-
-        if num_pages > 0:
-            is_digital = (len(markdown_text) / num_pages) > 100
-        else:
-            is_digital = False
-
-        logger.info(
-            "PDF parsed: %d pages, %d chars, is_digital=%s",
-            num_pages, len(markdown_text), is_digital,
-        )
-        return markdown_text, is_digital
+    digest = hashlib.sha256(pdf_bytes).digest()
+    with _text_cache_lock:
+        cached = _text_cache.get(digest)
+        if cached is not None:
+            _text_cache.move_to_end(digest)
+            return cached
 
+    try:
+        result = _parse_pdf(pdf_bytes)
     except Exception:
         logger.error("Failed to extract text from PDF", exc_info=True)
         return "", False
+
+    with _text_cache_lock:
+        _text_cache[digest] = result
+        if len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    return result
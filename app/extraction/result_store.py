@@ -0,0 +1,88 @@
+"""SQLite-backed extraction result store that survives app restarts."""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionStore:
+    """Persistent key -> JSON store for extraction results.
+
+    Keys are opaque strings built by the caller; values are serialized
+    quotes. Entries older than ``ttl_seconds`` read as misses and are
+    deleted when the store is opened. Storage errors are logged and
+    treated as misses so a bad cache file never blocks extraction; use
+    ``open_extraction_store`` to get the same guarantee at construction.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # One shared connection; the lock serializes access across threads
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS extractions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            # Expired rows are never read again; drop them so the file stays bounded
+            self._conn.execute(
+                "DELETE FROM extractions WHERE created_at < ?",
+                (time.time() - ttl_seconds,),
+            )
+
+    def get(self, key: str) -> str | None:
+        """Return the stored value for key, or None if missing or expired."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM extractions WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Extraction store read failed: %s", exc)
+            return None
+
+        if row is None:
+            return None
+        value, created_at = row
+        if time.time() - created_at > self._ttl_seconds:
+            return None
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        """Store value under key, replacing any previous entry."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO extractions (key, value, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, value, time.time()),
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Extraction store write failed: %s", exc)
+
+    def clear(self) -> None:
+        """Delete every stored result."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM extractions")
+        except sqlite3.Error as exc:
+            logger.warning("Extraction store clear failed: %s", exc)
+
+
+def open_extraction_store(path: str, ttl_seconds: float) -> ExtractionStore | None:
+    """Open the store, or return None if the path is unusable.
+
+    An unwritable directory or a corrupt / non-SQLite file is logged and
+    disables persistence instead of failing the import of the extractor.
+    """
+    try:
+        return ExtractionStore(path, ttl_seconds)
+    except (OSError, sqlite3.Error) as exc:
+        logger.warning("Extraction store disabled, cannot open %s: %s", path, exc)
+        return None
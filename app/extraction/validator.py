@@ -1,14 +1,30 @@
 import logging
+import re
 from datetime import date
 
 from app.extraction.models import InsuranceQuote
 
 logger = logging.getLogger(__name__)
 
-VALID_DEDUCTIBLES: frozenset[float] = frozenset(
+# Whole-dollar amounts; a float deductible like 1000.0 hashes equal to 1000
+VALID_DEDUCTIBLES: frozenset[int] = frozenset(
     [250, 500, 1000, 2500, 5000, 10000]
 )
-VALID_CONFIDENCE: frozenset[str] = frozenset(["high", "medium", "low"])
+
+# Shape check for YYYY-MM-DD; date.fromisoformat then only sees strings
+# that look right, so its exception is reserved for impossible dates
+_ISO_DATE_RE = re.compile(r"\A\d{4}-\d{2}-\d{2}\Z")
+
+
+def _is_iso_date(value: str) -> bool:
+    """True for a real calendar date written as YYYY-MM-DD."""
+    if not _ISO_DATE_RE.match(value):
+        return False
+    try:
+        date.fromisoformat(value)
+    except ValueError:  # e.g. 2025-02-30
+        return False
+    return True
 
 
 def validate_quote(quote: InsuranceQuote) -> tuple[InsuranceQuote, list[str]]:
@@ -29,29 +45,32 @@ def validate_quote(quote: InsuranceQuote) -> tuple[InsuranceQuote, list[str]]:
     if quote.deductible not in VALID_DEDUCTIBLES:
         warnings.append(f"Non-standard deductible: ${quote.deductible:,.0f}")
 
-    # 4. Coverage limits — each value must be positive
-    for key, value in quote.coverage_limits.model_dump(exclude_none=True).items():
-        if isinstance(value, (int, float)) and value <= 0:
-            warnings.append(f"Coverage limit '{key}' is non-positive: {value}")
+    # 4. Coverage limits — each value must be positive. Every CoverageLimits
+    # field is Optional[float], so iterate the model directly rather than
+    # building a dump dict and type-checking each value.
+    warnings.extend(
+        f"Coverage limit '{key}' is non-positive: {value}"
+        for key, value in quote.coverage_limits
+        if value is not None and value <= 0
+    )
 
     # 5. Effective date format
-    if quote.effective_date is not None:
-        try:
-            date.fromisoformat(quote.effective_date)
-        except ValueError:
-            warnings.append(f"Invalid effective date format: '{quote.effective_date}'")
-
-    # 6. Confidence — default to "low" if invalid
-    if quote.confidence not in VALID_CONFIDENCE:
+    if quote.effective_date is not None and not _is_iso_date(quote.effective_date):
+        warnings.append(f"Invalid effective date format: '{quote.effective_date}'")
+
+    # 6. Confidence — the model already defaulted an unrecognized value to
+    # "low" at parse time; surface the correction
+    if quote.invalid_confidence is not None:
         warnings.append(
-            f"Invalid confidence '{quote.confidence}', defaulted to 'low'"
+            f"Invalid confidence '{quote.invalid_confidence}', defaulted to 'low'"
         )
-        quote = quote.model_copy(update={"confidence": "low"})
 
+    # Guard on the level so the joined message is only built when it's emitted
     if warnings:
-        logger.warning("Quote '%s' has %d validation warning(s): %s",
-                        quote.carrier_name, len(warnings), "; ".join(warnings))
-    else:
+        if logger.isEnabledFor(logging.WARNING):
+            logger.warning("Quote '%s' has %d validation warning(s): %s",
+                            quote.carrier_name, len(warnings), "; ".join(warnings))
+    elif logger.isEnabledFor(logging.INFO):
         logger.info("Quote '%s' passed validation with no warnings", quote.carrier_name)
 
     return quote, warnings
@@ -10,8 +10,10 @@ Supports Current Policy baseline comparison column.
 from fpdf import FPDF
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
-import os
+from operator import attrgetter
+from typing import Callable, NamedTuple, Optional
+import functools
+import io
 import re
 
 from app.extraction.models import ComparisonSession, CarrierBundle, CurrentPolicy, InsuranceQuote
@@ -41,45 +43,89 @@ BRAND = {
 # ──────────────────────────────────────────────
 # Layout configuration based on total data columns
 # ──────────────────────────────────────────────
-def _get_layout(num_carriers: int, has_current: bool) -> dict:
+class Layout(NamedTuple):
+    """Page orientation, label column width and type sizes for a table."""
+    orientation: str
+    label_w: float
+    header_font: float
+    body_font: float
+    row_h: float
+
+
+def _get_layout(num_carriers: int, has_current: bool) -> Layout:
     """Return layout config based on total data columns."""
     total_data_cols = num_carriers + (1 if has_current else 0)
 
     # Portrait: 2-5 data columns, Landscape: 6-7 data columns
     if total_data_cols <= 3:
-        return {"orientation": "P", "label_w": 52, "header_font": 8, "body_font": 8, "row_h": 8}
+        return Layout(orientation="P", label_w=52, header_font=8, body_font=8, row_h=8)
     elif total_data_cols == 4:
-        return {"orientation": "P", "label_w": 50, "header_font": 7.5, "body_font": 7.5, "row_h": 8}
+        return Layout(orientation="P", label_w=50, header_font=7.5, body_font=7.5, row_h=8)
     elif total_data_cols == 5:
-        return {"orientation": "P", "label_w": 48, "header_font": 7.5, "body_font": 7.5, "row_h": 8}
+        return Layout(orientation="P", label_w=48, header_font=7.5, body_font=7.5, row_h=8)
     elif total_data_cols == 6:
-        return {"orientation": "L", "label_w": 50, "header_font": 7.5, "body_font": 7, "row_h": 7.5}
+        return Layout(orientation="L", label_w=50, header_font=7.5, body_font=7, row_h=7.5)
     else:  # 7 data columns (6 carriers + current)
-        return {"orientation": "L", "label_w": 46, "header_font": 7, "body_font": 6.5, "row_h": 7}
+        return Layout(orientation="L", label_w=46, header_font=7, body_font=6.5, row_h=7)
+
+
+# Unicode -> ASCII replacements for Helvetica, applied in one translate pass
+_SANITIZE_TABLE = str.maketrans({
+    "\u2013": "-",   # en dash
+    "\u2014": "-",   # em dash
+    "\u2018": "'",   # left single quote
+    "\u2019": "'",   # right single quote
+    "\u201c": '"',   # left double quote
+    "\u201d": '"',   # right double quote
+    "\u2022": "-",   # bullet
+    "\u2026": "...", # ellipsis
+    "\u00a0": " ",   # non-breaking space
+    "\u2010": "-",   # hyphen
+    "\u2011": "-",   # non-breaking hyphen
+    "\u2012": "-",   # figure dash
+    "\u00b7": "-",   # middle dot
+})
+
+
+# Non-ASCII labels and carrier names (e.g. "Safeco\u00ae") repeat on every row
+@functools.lru_cache(maxsize=4096)
+def _translate_to_ascii(text: str) -> str:
+    return text.translate(_SANITIZE_TABLE)
 
 
 def _sanitize_text(text: str) -> str:
     """Replace Unicode characters with ASCII equivalents for Helvetica compatibility."""
-    if not isinstance(text, str):
+    # Most cell values ("$1,234", "500/500") are already ASCII — return them
+    # as-is without a cache lookup or a translated copy
+    if not isinstance(text, str) or text.isascii():
         return text
-    replacements = {
-        "\u2013": "-",   # en dash
-        "\u2014": "-",   # em dash
-        "\u2018": "'",   # left single quote
-        "\u2019": "'",   # right single quote
-        "\u201c": '"',   # left double quote
-        "\u201d": '"',   # right double quote
-        "\u2022": "-",   # bullet
-        "\u2026": "...", # ellipsis
-        "\u00a0": " ",   # non-breaking space
-        "\u2010": "-",   # hyphen
-        "\u2011": "-",   # non-breaking hyphen
-        "\u2012": "-",   # figure dash
-        "\u00b7": "-",   # middle dot
-    }
-    for unicode_char, ascii_char in replacements.items():
-        text = text.replace(unicode_char, ascii_char)
-    return text
+    return _translate_to_ascii(text)
+
+
+# Deductibles and limits ($500, $1,000, $1M) repeat across carriers and rows
+@functools.lru_cache(maxsize=2048)
+def _fmt_amount(v: float) -> str:
+    if v >= 1000:
+        return f"${v:,.0f}"
+    else:
+        return f"${v:,.2f}"
+
+
+def _fmt_currency(value) -> str:
+    if value is None:
+        return "-"  # Simple dash for consistency with Sheets
+    try:
+        v = float(value)
+    except (ValueError, TypeError):
+        return _sanitize_text(str(value))
+    return _fmt_amount(v)
+
+
+# The same agency logo goes on every generated PDF; read it from disk once
+# per process. Failed reads raise and so aren't cached.
+@functools.lru_cache(maxsize=8)
+def _load_logo(path: str) -> bytes:
+    return Path(path).read_bytes()
 
 
 def _session_has_multi_dwelling(
@@ -87,25 +133,241 @@ def _session_has_multi_dwelling(
     carriers: list[CarrierBundle]
 ) -> bool:
     """Detect if session has multi-dwelling data."""
-    if current_policy and current_policy.home_2_premium:
-        return True
-    return any(c.home_2 is not None for c in carriers)
+    return bool(current_policy and current_policy.home_2_premium) or any(
+        c.home_2 is not None for c in carriers
+    )
+
+
+# Home detail rows: (label, quote getter, Dwelling 1 current getter,
+# Dwelling 2 current getter). Getters are built once so the per-cell lookup
+# is a single C call; None means the field isn't on CurrentPolicy.
+_HOME_ROWS = (
+    ("Dwelling (Cov A)", attrgetter("coverage_limits.dwelling"),
+     attrgetter("home_dwelling"), attrgetter("home_2_dwelling")),
+    ("Other Structures (B)", attrgetter("coverage_limits.other_structures"),
+     attrgetter("home_other_structures"), attrgetter("home_2_other_structures")),
+    ("Personal Property (C)", attrgetter("coverage_limits.personal_property"),
+     attrgetter("home_personal_property"), attrgetter("home_2_personal_property")),
+    ("Loss of Use (D)", attrgetter("coverage_limits.loss_of_use"),
+     attrgetter("home_loss_of_use"), attrgetter("home_2_loss_of_use")),
+    ("Personal Liability (E)", attrgetter("coverage_limits.personal_liability"),
+     attrgetter("home_liability"), attrgetter("home_2_liability")),
+    ("Medical Payments (F)", attrgetter("coverage_limits.medical_payments"), None, None),
+    # A zero deductible means it wasn't extracted, so it shows as "-"
+    ("All-Peril Deductible", lambda quote: quote.deductible or None,
+     attrgetter("home_deductible"), attrgetter("home_2_deductible")),
+    ("Wind/Hail Deductible", lambda quote: quote.wind_hail_deductible or None, None, None),
+)
+
+# Fixed table labels and section titles, padded and already ASCII so they're
+# drawn with _raw_cell and never pass through _sanitize_text
+_LBL_COVERAGE = "  COVERAGE"
+_LBL_TOTAL = "  Total"
+_TITLE_PREMIUM = "  PREMIUM SUMMARY"
+_TITLE_HOME = "  HOME DETAILS"
+_TITLE_DWELLING_1 = "  DWELLING 1"
+_TITLE_DWELLING_2 = "  DWELLING 2"
+_TITLE_AUTO = "  AUTO DETAILS"
+_TITLE_UMBRELLA = "  UMBRELLA DETAILS"
 
 
 _BRACKET_TAG_RE = re.compile(r"^\s*\[\w+\]\s*")
+_BRACKET_TAG_SUB = _BRACKET_TAG_RE.sub
 
 
 def _strip_bracket_tag(text: str) -> str:
     """Remove leading bracket tags like [home], [auto] from note strings."""
-    if not isinstance(text, str):
+    # Most notes are untagged; skip the regex unless one could be present
+    if not isinstance(text, str) or not text.lstrip().startswith("["):
         return text
-    return _BRACKET_TAG_RE.sub("", text)
+    return _BRACKET_TAG_SUB("", text, 1)
+
+
+# Bundle policy slots in display order, with their labels in the notes section
+_POLICY_SLOTS = (
+    ("Home", attrgetter("home")),
+    ("Home 2", attrgetter("home_2")),
+    ("Auto", attrgetter("auto")),
+    ("Umbrella", attrgetter("umbrella")),
+)
+
+
+def _bundle_quotes(bundle: CarrierBundle) -> list[tuple[str, InsuranceQuote]]:
+    """(label, quote) for each policy present in the bundle, in display order."""
+    return [(label, quote) for label, get in _POLICY_SLOTS if (quote := get(bundle))]
+
+
+def _collect_endorsements_discounts(bundle: CarrierBundle) -> tuple[str, str]:
+    """Joined endorsements and discounts across the bundle, deduplicated in first-seen order."""
+    endorsements: dict[str, None] = {}
+    discounts: dict[str, None] = {}
+    for _, quote in _bundle_quotes(bundle):
+        for item in quote.endorsements:
+            endorsements[item] = None
+        for item in quote.discounts_applied:
+            discounts[item] = None
+    return ", ".join(endorsements), ", ".join(discounts)
+
+
+# ──────────────────────────────────────────────
+# Data Extraction Helpers — row values for the comparison table
+# ──────────────────────────────────────────────
+def _extract_premium_row(
+    policy_type: str,  # "home", "auto", or "umbrella"
+    current_policy: Optional[CurrentPolicy],
+    carriers: list[CarrierBundle]
+) -> list[str]:
+    """Extract premium values for a given policy type."""
+    values = []
+
+    # Current Policy value
+    if current_policy:
+        if policy_type == "home":
+            values.append(_fmt_currency(current_policy.home_premium))
+        elif policy_type == "home_2":
+            values.append(_fmt_currency(current_policy.home_2_premium))
+        elif policy_type == "auto":
+            values.append(_fmt_currency(current_policy.auto_premium))
+        elif policy_type == "umbrella":
+            values.append(_fmt_currency(current_policy.umbrella_premium))
+
+    # Carrier values
+    for carrier in carriers:
+        if policy_type == "home" and carrier.home:
+            values.append(_fmt_currency(carrier.home.annual_premium))
+        elif policy_type == "home_2" and carrier.home_2:
+            values.append(_fmt_currency(carrier.home_2.annual_premium))
+        elif policy_type == "auto" and carrier.auto:
+            values.append(_fmt_currency(carrier.auto.annual_premium))
+        elif policy_type == "umbrella" and carrier.umbrella:
+            values.append(_fmt_currency(carrier.umbrella.annual_premium))
+        else:
+            values.append("-")
+
+    return values
+
+
+def _extract_home_row(
+    quote_get: Callable[[InsuranceQuote], object],  # from _HOME_ROWS
+    current_get: Optional[Callable[[CurrentPolicy], object]],  # None if not on CurrentPolicy
+    current_policy: Optional[CurrentPolicy],
+    carriers: list[CarrierBundle],
+    dwelling: int = 1  # 1 for primary, 2 for Dwelling 2
+) -> list[str]:
+    """Extract home coverage row values for a given dwelling number."""
+    values = []
+
+    # Current Policy value
+    if current_policy and current_get:
+        values.append(_fmt_currency(current_get(current_policy)))
+    elif current_policy:
+        values.append("-")  # Field doesn't exist on CurrentPolicy
+
+    # Carrier values — select the right dwelling quote
+    for carrier in carriers:
+        quote = carrier.home if dwelling == 1 else carrier.home_2
+        if not quote:
+            values.append("-")
+            continue
+        values.append(_fmt_cell(quote_get(quote)))  # Text like "ALS" passes through
+
+    return values
+
+
+def _fmt_cell(val) -> str:
+    """Cell text: "-" when missing, text passed through, numbers as currency."""
+    if val is None:
+        return "-"
+    if type(val) is str:
+        return _sanitize_text(val)
+    return _fmt_currency(val)
+
+
+def _extract_policy_row(
+    slot_get: Callable[[CarrierBundle], Optional[InsuranceQuote]],  # bundle -> auto/umbrella quote
+    quote_get: Callable[[InsuranceQuote], object],  # from _AUTO_ROWS / _UMBRELLA_ROWS
+    current_get: Callable[[CurrentPolicy], object],
+    current_policy: Optional[CurrentPolicy],
+    carriers: list[CarrierBundle]
+) -> list[str]:
+    """Extract auto or umbrella coverage row values."""
+    values = []
+
+    # Current Policy value
+    if current_policy:
+        values.append(_fmt_cell(current_get(current_policy)))
+
+    # Carrier values
+    for carrier in carriers:
+        quote = slot_get(carrier)
+        values.append(_fmt_cell(quote_get(quote)) if quote else "-")
+
+    return values
+
+
+def _get_auto_limits(quote: InsuranceQuote) -> str:
+    """Format auto liability limits into display string."""
+    cl = quote.coverage_limits
+
+    # Split limits: BI/BI/PD format (limits are whole dollars; int // stays in ints)
+    if cl.bi_per_person and cl.bi_per_accident and cl.pd_per_accident:
+        return f"{int(cl.bi_per_person) // 1000}/{int(cl.bi_per_accident) // 1000}/{int(cl.pd_per_accident) // 1000}"
+
+    # CSL (Combined Single Limit)
+    if cl.csl:
+        csl = int(cl.csl)
+        if csl >= 1_000_000:
+            return f"{csl // 1_000_000}M CSL"
+        else:
+            return f"{csl // 1000}K CSL"
+
+    return "-"
+
+
+def _get_umbrella_limits(quote: InsuranceQuote) -> str:
+    """Format umbrella limits into display string."""
+    limit = quote.coverage_limits.umbrella_limit
+
+    if limit is None:
+        return "-"
+
+    # Format numeric values >= 1M as "XM CSL"
+    if limit >= 1_000_000:
+        return f"{int(limit) // 1_000_000}M CSL"
+
+    # Smaller values return as currency
+    return _fmt_currency(limit)
+
+
+# Auto and umbrella rows: (label, quote getter, CurrentPolicy getter). The
+# limits rows format the whole limit set; the rest read a single field.
+_AUTO_SLOT = attrgetter("auto")
+_AUTO_ROWS = (
+    ("Limits", _get_auto_limits, attrgetter("auto_limits")),
+    ("UM/UIM", attrgetter("coverage_limits.um_uim"), attrgetter("auto_um_uim")),
+    ("Deductibles (Comp)", attrgetter("coverage_limits.comprehensive"), attrgetter("auto_comp_deductible")),
+    ("Deductibles (Collision)", attrgetter("deductible"), attrgetter("auto_collision_deductible")),
+)
+
+_UMBRELLA_SLOT = attrgetter("umbrella")
+_UMBRELLA_ROWS = (
+    ("Limits", _get_umbrella_limits, attrgetter("umbrella_limits")),
+    # A zero umbrella deductible displays as "-"
+    ("Deductible", lambda quote: quote.deductible or None, attrgetter("umbrella_deductible")),
+)
 
 
 class SciotoComparisonPDF(FPDF):
     """Custom FPDF subclass with Scioto Insurance Group branding."""
 
     def __init__(self, logo_path: Optional[str] = None, orientation: str = "P"):
+        # Last color set through the overrides below; set before FPDF.__init__
+        # in case it sets colors itself
+        self._last_fill_key = self._last_fill_color = None
+        self._last_text_key = self._last_text_color = None
+        # Data column count and x positions, set per table by add_comparison_table
+        self._num_data_cols = 0
+        self._col_xs: tuple[float, ...] = ()
         super().__init__(orientation=orientation, unit="mm", format="Letter")
         self.logo_path = logo_path
         self.set_auto_page_break(auto=True, margin=25)
@@ -123,6 +385,33 @@ class SciotoComparisonPDF(FPDF):
         """Override to sanitize text before rendering (safety net)."""
         return super().cell(w, h, _sanitize_text(text), *args, **kwargs)
 
+    def set_fill_color(self, r, g=-1, b=-1):
+        """Skip re-emitting the fill color when it's already current on this page.
+
+        The table helpers reset colors for every cell, and fpdf2 writes a
+        color operator on each call. The identity check on self.fill_color
+        catches changes made outside this method (page setup, local_context).
+        """
+        key = (r, g, b, self.page)
+        if key == self._last_fill_key and self.fill_color is self._last_fill_color:
+            return
+        super().set_fill_color(r, g, b)
+        self._last_fill_key = key
+        self._last_fill_color = self.fill_color
+
+    def set_text_color(self, r, g=-1, b=-1):
+        """Skip redundant text-color conversions (see set_fill_color)."""
+        key = (r, g, b)
+        if key == self._last_text_key and self.text_color is self._last_text_color:
+            return
+        super().set_text_color(r, g, b)
+        self._last_text_key = key
+        self._last_text_color = self.text_color
+
+    # Unsanitized cell for the comparison table, whose helpers pass text that
+    # is already sanitized (or ASCII by construction) — skips a second pass
+    _raw_cell = FPDF.cell
+
     def multi_cell(self, w, h=None, text="", *args, **kwargs):
         """Override to sanitize text before rendering (safety net)."""
         return super().multi_cell(w, h, _sanitize_text(text), *args, **kwargs)
@@ -167,8 +456,13 @@ class SciotoComparisonPDF(FPDF):
         self.rect(0, 35, page_w, 3, "F")
 
         # Logo
-        if self.logo_path and os.path.exists(self.logo_path):
-            self.image(self.logo_path, x=10, y=3, h=32)
+        if self.logo_path:
+            try:
+                logo_bytes = _load_logo(self.logo_path)
+            except OSError:
+                logo_bytes = None  # Missing or unreadable — header renders without it
+            if logo_bytes:
+                self.image(io.BytesIO(logo_bytes), x=10, y=3, h=32)
 
         # Agency name + contact (right-aligned, on banner)
         self.set_font(self.font_family_name, "B", 16)
@@ -293,7 +587,7 @@ class SciotoComparisonPDF(FPDF):
     def add_comparison_table(
         self,
         session: ComparisonSession,
-        layout: dict
+        layout: Layout
     ):
         """Build multi-section comparison table: Premium Summary → Home → Auto → Umbrella."""
 
@@ -303,17 +597,25 @@ class SciotoComparisonPDF(FPDF):
         page_w = self.w
         margin = 15
         usable_w = page_w - 2 * margin
-        label_col_w = layout["label_w"]
+        label_col_w = layout.label_w
 
         # Data columns = current (0 or 1) + carriers (2-6)
         num_data_cols = num_carriers + (1 if has_current else 0)
         data_col_w = (usable_w - label_col_w) / num_data_cols
 
         # Extract font sizes from layout
-        hf = layout["header_font"]
-        bf = layout["body_font"]
-        row_h = layout["row_h"]
+        hf = layout.header_font
+        bf = layout.body_font
+        row_h = layout.row_h
         x_start = margin
+        is_multi_dw = _session_has_multi_dwelling(session.current_policy, session.carriers)
+
+        self._num_data_cols = num_data_cols
+
+        # Left edge of each data column, shared by every row of this table
+        self._col_xs = tuple(
+            x_start + label_col_w + i * data_col_w for i in range(num_data_cols)
+        )
 
         # ── TABLE HEADER ROW ──
         self._add_table_header(
@@ -324,14 +626,15 @@ class SciotoComparisonPDF(FPDF):
         # ── SECTION 1: PREMIUM SUMMARY (always shown) ──
         self._add_premium_section(
             x_start, label_col_w, data_col_w, bf, row_h,
-            session.current_policy, session.carriers, session.sections_included
+            session.current_policy, session.carriers, session.sections_included,
+            is_multi_dw
         )
 
         # ── SECTION 2: HOME DETAILS ──
         if "home" in session.sections_included:
             self._add_home_section(
                 x_start, label_col_w, data_col_w, bf, row_h,
-                session.current_policy, session.carriers
+                session.current_policy, session.carriers, is_multi_dw
             )
 
         # ── SECTION 3: AUTO DETAILS ──
@@ -366,29 +669,32 @@ class SciotoComparisonPDF(FPDF):
         self.set_text_color(*BRAND["white"])
         self.set_font(self.font_family_name, "B", header_font)
         self.set_xy(x_start, y)
-        self.cell(label_col_w, 10, _sanitize_text("  COVERAGE"), border=1, fill=True, align="L")
+        self._raw_cell(label_col_w, 10, _LBL_COVERAGE, border=1, fill=True, align="L")
 
         col_idx = 0
 
         # Current Policy column (if exists)
         if current_policy:
-            x = x_start + label_col_w + col_idx * data_col_w
-            self.set_xy(x, y)
+            self.set_xy(self._col_xs[col_idx], y)
             self.set_fill_color(*BRAND["current_header"])
             self.set_text_color(*BRAND["white"])
-            self.cell(data_col_w, 10, _sanitize_text(current_policy.carrier_name), border=1, fill=True, align="C")
+            self._raw_cell(data_col_w, 10, _sanitize_text(current_policy.carrier_name), border=1, fill=True, align="C")
             col_idx += 1
 
-        # Carrier columns
+        # Carrier columns — colors are the same for every carrier, so set them
+        # once and keep the per-column calls in locals
+        self.set_fill_color(*BRAND["primary"])
+        self.set_text_color(*BRAND["white"])
+        set_xy = self.set_xy
+        raw_cell = self._raw_cell
+        col_xs = self._col_xs
+        truncate = data_col_w < 35
         for carrier in carriers:
-            x = x_start + label_col_w + col_idx * data_col_w
-            self.set_xy(x, y)
-            self.set_fill_color(*BRAND["primary"])
-            self.set_text_color(*BRAND["white"])
+            set_xy(col_xs[col_idx], y)
             name = carrier.carrier_name
-            if data_col_w < 35 and len(name) > 14:
+            if truncate and len(name) > 14:
                 name = name[:13] + "..."
-            self.cell(data_col_w, 10, _sanitize_text(name), border=1, fill=True, align="C")
+            raw_cell(data_col_w, 10, _sanitize_text(name), border=1, fill=True, align="C")
             col_idx += 1
 
         self.ln(10)
@@ -402,16 +708,15 @@ class SciotoComparisonPDF(FPDF):
         row_h: float,
         current_policy: Optional[CurrentPolicy],
         carriers: list[CarrierBundle],
-        sections_included: list[str]
+        sections_included: list[str],
+        is_multi_dw: bool
     ):
         """Premium Summary section: Home, Auto, Umbrella, Total."""
         self._add_section_divider_row(
-            "PREMIUM SUMMARY", label_col_w, data_col_w, x_start, body_font,
-            current_policy, carriers
+            _TITLE_PREMIUM, label_col_w, data_col_w, x_start, body_font
         )
 
         row_idx = 0
-        is_multi_dw = _session_has_multi_dwelling(current_policy, carriers)
 
         # Home Premium (if included)
         if "home" in sections_included:
@@ -419,7 +724,7 @@ class SciotoComparisonPDF(FPDF):
                 # Split into Home 1 / Home 2 rows
                 self._add_data_row(
                     label="Home 1 Premium",
-                    values=self._extract_premium_row("home", current_policy, carriers),
+                    values=_extract_premium_row("home", current_policy, carriers),
                     row_idx=row_idx,
                     label_col_w=label_col_w,
                     data_col_w=data_col_w,
@@ -431,7 +736,7 @@ class SciotoComparisonPDF(FPDF):
                 row_idx += 1
                 self._add_data_row(
                     label="Home 2 Premium",
-                    values=self._extract_premium_row("home_2", current_policy, carriers),
+                    values=_extract_premium_row("home_2", current_policy, carriers),
                     row_idx=row_idx,
                     label_col_w=label_col_w,
                     data_col_w=data_col_w,
@@ -444,7 +749,7 @@ class SciotoComparisonPDF(FPDF):
             else:
                 self._add_data_row(
                     label="Home Premium",
-                    values=self._extract_premium_row("home", current_policy, carriers),
+                    values=_extract_premium_row("home", current_policy, carriers),
                     row_idx=row_idx,
                     label_col_w=label_col_w,
                     data_col_w=data_col_w,
@@ -459,7 +764,7 @@ class SciotoComparisonPDF(FPDF):
         if "auto" in sections_included:
             self._add_data_row(
                 label="Auto Premium",
-                values=self._extract_premium_row("auto", current_policy, carriers),
+                values=_extract_premium_row("auto", current_policy, carriers),
                 row_idx=row_idx,
                 label_col_w=label_col_w,
                 data_col_w=data_col_w,
@@ -474,7 +779,7 @@ class SciotoComparisonPDF(FPDF):
         if "umbrella" in sections_included:
             self._add_data_row(
                 label="Umbrella Premium",
-                values=self._extract_premium_row("umbrella", current_policy, carriers),
+                values=_extract_premium_row("umbrella", current_policy, carriers),
                 row_idx=row_idx,
                 label_col_w=label_col_w,
                 data_col_w=data_col_w,
@@ -499,36 +804,22 @@ class SciotoComparisonPDF(FPDF):
         body_font: float,
         row_h: float,
         current_policy: Optional[CurrentPolicy],
-        carriers: list[CarrierBundle]
+        carriers: list[CarrierBundle],
+        is_multi_dw: bool
     ):
         """Home Details section: Dwelling, Other Structures, etc."""
-        is_multi_dw = _session_has_multi_dwelling(current_policy, carriers)
-
         self.ln(3)  # Small gap between sections
         self._add_section_divider_row(
-            "HOME DETAILS", label_col_w, data_col_w, x_start, body_font,
-            current_policy, carriers
+            _TITLE_HOME, label_col_w, data_col_w, x_start, body_font
         )
 
-        home_rows = [
-            ("Dwelling (Cov A)", "dwelling", "home_dwelling"),
-            ("Other Structures (B)", "other_structures", "home_other_structures"),
-            ("Personal Property (C)", "personal_property", "home_personal_property"),
-            ("Loss of Use (D)", "loss_of_use", "home_loss_of_use"),
-            ("Personal Liability (E)", "personal_liability", "home_liability"),
-            ("Medical Payments (F)", "medical_payments", None),  # Not on CurrentPolicy
-            ("All-Peril Deductible", "deductible", "home_deductible"),
-            ("Wind/Hail Deductible", "wind_hail_deductible", None),
-        ]
-
         if is_multi_dw:
             # Dwelling 1 sub-section
             self._add_sub_divider_row(
-                "DWELLING 1", label_col_w, data_col_w, x_start, body_font,
-                current_policy, carriers
+                _TITLE_DWELLING_1, label_col_w, data_col_w, x_start, body_font
             )
-            for row_idx, (label, carrier_key, current_key) in enumerate(home_rows):
-                values = self._extract_home_row(carrier_key, current_key, current_policy, carriers, dwelling=1)
+            for row_idx, (label, quote_get, current_get, _) in enumerate(_HOME_ROWS):
+                values = _extract_home_row(quote_get, current_get, current_policy, carriers, dwelling=1)
                 self._add_data_row(
                     label=label, values=values, row_idx=row_idx,
                     label_col_w=label_col_w, data_col_w=data_col_w, x_start=x_start,
@@ -537,11 +828,10 @@ class SciotoComparisonPDF(FPDF):
 
             # Dwelling 2 sub-section
             self._add_sub_divider_row(
-                "DWELLING 2", label_col_w, data_col_w, x_start, body_font,
-                current_policy, carriers
+                _TITLE_DWELLING_2, label_col_w, data_col_w, x_start, body_font
             )
-            for row_idx, (label, carrier_key, current_key) in enumerate(home_rows):
-                values = self._extract_home_row(carrier_key, current_key, current_policy, carriers, dwelling=2)
+            for row_idx, (label, quote_get, _, current_get) in enumerate(_HOME_ROWS):
+                values = _extract_home_row(quote_get, current_get, current_policy, carriers, dwelling=2)
                 self._add_data_row(
                     label=label, values=values, row_idx=row_idx,
                     label_col_w=label_col_w, data_col_w=data_col_w, x_start=x_start,
@@ -549,8 +839,8 @@ class SciotoComparisonPDF(FPDF):
                 )
         else:
             # Single dwelling — no sub-dividers
-            for row_idx, (label, carrier_key, current_key) in enumerate(home_rows):
-                values = self._extract_home_row(carrier_key, current_key, current_policy, carriers)
+            for row_idx, (label, quote_get, current_get, _) in enumerate(_HOME_ROWS):
+                values = _extract_home_row(quote_get, current_get, current_policy, carriers)
                 self._add_data_row(
                     label=label, values=values, row_idx=row_idx,
                     label_col_w=label_col_w, data_col_w=data_col_w, x_start=x_start,
@@ -570,19 +860,11 @@ class SciotoComparisonPDF(FPDF):
         """Auto Details section: Limits, UM/UIM, Deductibles."""
         self.ln(3)
         self._add_section_divider_row(
-            "AUTO DETAILS", label_col_w, data_col_w, x_start, body_font,
-            current_policy, carriers
+            _TITLE_AUTO, label_col_w, data_col_w, x_start, body_font
         )
 
-        auto_rows = [
-            ("Limits", "limits", "auto_limits"),
-            ("UM/UIM", "um_uim", "auto_um_uim"),
-            ("Deductibles (Comp)", "comprehensive", "auto_comp_deductible"),
-            ("Deductibles (Collision)", "collision", "auto_collision_deductible"),
-        ]
-
-        for row_idx, (label, carrier_key, current_key) in enumerate(auto_rows):
-            values = self._extract_auto_row(carrier_key, current_key, current_policy, carriers)
+        for row_idx, (label, quote_get, current_get) in enumerate(_AUTO_ROWS):
+            values = _extract_policy_row(_AUTO_SLOT, quote_get, current_get, current_policy, carriers)
             self._add_data_row(
                 label=label,
                 values=values,
@@ -610,17 +892,11 @@ class SciotoComparisonPDF(FPDF):
         self._ensure_space(90)
         self.ln(3)
         self._add_section_divider_row(
-            "UMBRELLA DETAILS", label_col_w, data_col_w, x_start, body_font,
-            current_policy, carriers
+            _TITLE_UMBRELLA, label_col_w, data_col_w, x_start, body_font
         )
 
-        umbrella_rows = [
-            ("Limits", "limits", "umbrella_limits"),
-            ("Deductible", "deductible", "umbrella_deductible"),
-        ]
-
-        for row_idx, (label, carrier_key, current_key) in enumerate(umbrella_rows):
-            values = self._extract_umbrella_row(carrier_key, current_key, current_policy, carriers)
+        for row_idx, (label, quote_get, current_get) in enumerate(_UMBRELLA_ROWS):
+            values = _extract_policy_row(_UMBRELLA_SLOT, quote_get, current_get, current_policy, carriers)
             self._add_data_row(
                 label=label,
                 values=values,
@@ -652,220 +928,34 @@ class SciotoComparisonPDF(FPDF):
         self.set_text_color(*BRAND["primary_dark"])
         self.set_font(self.font_family_name, "B", body_font + 1)
         self.set_xy(x_start, y)
-        self.cell(label_col_w, row_h + 2, _sanitize_text("  Total"), border=1, fill=True, align="L")
+        self._raw_cell(label_col_w, row_h + 2, _LBL_TOTAL, border=1, fill=True, align="L")
 
         col_idx = 0
 
         # Current Policy total
         if current_policy:
-            x = x_start + label_col_w + col_idx * data_col_w
-            self.set_xy(x, y)
+            self.set_xy(self._col_xs[col_idx], y)
             self.set_fill_color(*BRAND["current_bg"])
             self.set_text_color(*BRAND["primary_dark"])
-            total_str = _sanitize_text(self._fmt_currency(current_policy.total_premium))
-            self.cell(data_col_w, row_h + 2, total_str, border=1, fill=True, align="C")
+            total_str = _fmt_currency(current_policy.total_premium)
+            self._raw_cell(data_col_w, row_h + 2, total_str, border=1, fill=True, align="C")
             col_idx += 1
 
         # Carrier totals
+        self.set_fill_color(*BRAND["cream"])
+        self.set_text_color(*BRAND["primary_dark"])
+        set_xy = self.set_xy
+        raw_cell = self._raw_cell
+        col_xs = self._col_xs
+        cell_h = row_h + 2
         for carrier in carriers:
-            x = x_start + label_col_w + col_idx * data_col_w
-            self.set_xy(x, y)
-            self.set_fill_color(*BRAND["cream"])
-            self.set_text_color(*BRAND["primary_dark"])
-            total_str = _sanitize_text(self._fmt_currency(carrier.total_premium))
-            self.cell(data_col_w, row_h + 2, total_str, border=1, fill=True, align="C")
+            set_xy(col_xs[col_idx], y)
+            total_str = _fmt_currency(carrier.total_premium)
+            raw_cell(data_col_w, cell_h, total_str, border=1, fill=True, align="C")
             col_idx += 1
 
         self.ln(row_h + 2)
 
-    # ──────────────────────────────────────────
-    # Data Extraction Helpers
-    # ──────────────────────────────────────────
-    def _extract_premium_row(
-        self,
-        policy_type: str,  # "home", "auto", or "umbrella"
-        current_policy: Optional[CurrentPolicy],
-        carriers: list[CarrierBundle]
-    ) -> list[str]:
-        """Extract premium values for a given policy type."""
-        values = []
-
-        # Current Policy value
-        if current_policy:
-            if policy_type == "home":
-                values.append(self._fmt_currency(current_policy.home_premium))
-            elif policy_type == "home_2":
-                values.append(self._fmt_currency(current_policy.home_2_premium))
-            elif policy_type == "auto":
-                values.append(self._fmt_currency(current_policy.auto_premium))
-            elif policy_type == "umbrella":
-                values.append(self._fmt_currency(current_policy.umbrella_premium))
-
-        # Carrier values
-        for carrier in carriers:
-            if policy_type == "home" and carrier.home:
-                values.append(self._fmt_currency(carrier.home.annual_premium))
-            elif policy_type == "home_2" and carrier.home_2:
-                values.append(self._fmt_currency(carrier.home_2.annual_premium))
-            elif policy_type == "auto" and carrier.auto:
-                values.append(self._fmt_currency(carrier.auto.annual_premium))
-            elif policy_type == "umbrella" and carrier.umbrella:
-                values.append(self._fmt_currency(carrier.umbrella.annual_premium))
-            else:
-                values.append("-")
-
-        return values
-
-    def _extract_home_row(
-        self,
-        carrier_key: str,  # e.g., "dwelling", "deductible"
-        current_key: Optional[str],  # e.g., "home_dwelling", "home_deductible"
-        current_policy: Optional[CurrentPolicy],
-        carriers: list[CarrierBundle],
-        dwelling: int = 1  # 1 for primary, 2 for Dwelling 2
-    ) -> list[str]:
-        """Extract home coverage row values for a given dwelling number."""
-        values = []
-
-        # For Dwelling 2, adjust current_key to home_2_* prefix
-        effective_current_key = current_key
-        if dwelling == 2 and current_key:
-            effective_current_key = current_key.replace("home_", "home_2_", 1)
-
-        # Current Policy value
-        if current_policy and effective_current_key:
-            current_val = getattr(current_policy, effective_current_key, None)
-            values.append(self._fmt_currency(current_val))
-        elif current_policy:
-            values.append("-")  # Field doesn't exist on CurrentPolicy
-
-        # Carrier values — select the right dwelling quote
-        for carrier in carriers:
-            quote = carrier.home if dwelling == 1 else carrier.home_2
-            if not quote:
-                values.append("-")
-            elif carrier_key in ["deductible", "wind_hail_deductible"]:
-                # Direct attributes on InsuranceQuote
-                val = getattr(quote, carrier_key, None)
-                values.append(self._fmt_currency(val) if val else "-")
-            else:
-                # coverage_limits model field
-                val = getattr(quote.coverage_limits, carrier_key, None)
-                if val is None:
-                    values.append("-")
-                elif isinstance(val, str):
-                    values.append(val)  # Pass through text like "ALS"
-                else:
-                    values.append(self._fmt_currency(val))
-
-        return values
-
-    def _extract_auto_row(
-        self,
-        carrier_key: str,  # "limits", "um_uim", "comprehensive", "collision"
-        current_key: str,  # "auto_limits", "auto_um_uim", etc.
-        current_policy: Optional[CurrentPolicy],
-        carriers: list[CarrierBundle]
-    ) -> list[str]:
-        """Extract auto coverage row values."""
-        values = []
-
-        # Current Policy value
-        if current_policy:
-            current_val = getattr(current_policy, current_key, None)
-            if current_val is None:
-                values.append("-")
-            elif isinstance(current_val, str):
-                values.append(current_val)
-            else:
-                values.append(self._fmt_currency(current_val))
-
-        # Carrier values
-        for carrier in carriers:
-            if not carrier.auto:
-                values.append("-")
-            elif carrier_key == "limits":
-                # Use helper from sheets_client pattern
-                values.append(self._get_auto_limits(carrier.auto))
-            elif carrier_key == "collision":
-                # Direct deductible attribute
-                values.append(self._fmt_currency(carrier.auto.deductible))
-            else:
-                # coverage_limits model field (um_uim, comprehensive)
-                val = getattr(carrier.auto.coverage_limits, carrier_key, None)
-                if val is None:
-                    values.append("-")
-                elif isinstance(val, str):
-                    values.append(val)
-                else:
-                    values.append(self._fmt_currency(val))
-
-        return values
-
-    def _extract_umbrella_row(
-        self,
-        carrier_key: str,  # "limits" or "deductible"
-        current_key: str,  # "umbrella_limits" or "umbrella_deductible"
-        current_policy: Optional[CurrentPolicy],
-        carriers: list[CarrierBundle]
-    ) -> list[str]:
-        """Extract umbrella coverage row values."""
-        values = []
-
-        # Current Policy value
-        if current_policy:
-            current_val = getattr(current_policy, current_key, None)
-            if current_val is None:
-                values.append("-")
-            elif isinstance(current_val, str):
-                values.append(current_val)
-            else:
-                values.append(self._fmt_currency(current_val))
-
-        # Carrier values
-        for carrier in carriers:
-            if not carrier.umbrella:
-                values.append("-")
-            elif carrier_key == "limits":
-                # Use helper from sheets_client pattern
-                values.append(self._get_umbrella_limits(carrier.umbrella))
-            else:  # deductible
-                val = carrier.umbrella.deductible
-                values.append(self._fmt_currency(val) if val else "-")
-
-        return values
-
-    def _get_auto_limits(self, quote: InsuranceQuote) -> str:
-        """Format auto liability limits into display string."""
-        cl = quote.coverage_limits
-
-        # Split limits: BI/BI/PD format
-        if cl.bi_per_person and cl.bi_per_accident and cl.pd_per_accident:
-            return f"{int(cl.bi_per_person/1000)}/{int(cl.bi_per_accident/1000)}/{int(cl.pd_per_accident/1000)}"
-
-        # CSL (Combined Single Limit)
-        if cl.csl:
-            if cl.csl >= 1_000_000:
-                return f"{int(cl.csl/1_000_000)}M CSL"
-            else:
-                return f"{int(cl.csl/1000)}K CSL"
-
-        return "-"
-
-    def _get_umbrella_limits(self, quote: InsuranceQuote) -> str:
-        """Format umbrella limits into display string."""
-        limit = quote.coverage_limits.umbrella_limit
-
-        if limit is None:
-            return "-"
-
-        # Format numeric values >= 1M as "XM CSL"
-        if limit >= 1_000_000:
-            return f"{int(limit/1_000_000)}M CSL"
-
-        # Smaller values return as currency
-        return self._fmt_currency(limit)
-
     # ──────────────────────────────────────────
     # Helpers
     # ──────────────────────────────────────────
@@ -875,22 +965,19 @@ class SciotoComparisonPDF(FPDF):
         label_w: float,
         data_col_w: float,
         x_start: float,
-        font_size: float,
-        current_policy: Optional[CurrentPolicy],
-        carriers: list[CarrierBundle]
+        font_size: float
     ):
-        """Dark mini-header to separate table sections."""
+        """Dark mini-header to separate table sections. title is a _TITLE_* constant."""
         self._ensure_space(8)
         y = self.get_y()
 
-        num_data_cols = len(carriers) + (1 if current_policy else 0)
-        total_w = label_w + num_data_cols * data_col_w
+        total_w = label_w + self._num_data_cols * data_col_w
 
         self.set_fill_color(*BRAND["primary_dark"])
         self.set_text_color(*BRAND["white"])
         self.set_font(self.font_family_name, "B", font_size - 1)
         self.set_xy(x_start, y)
-        self.cell(total_w, 6, _sanitize_text(f"  {title}"), border=1, fill=True, align="L")
+        self._raw_cell(total_w, 6, title, border=1, fill=True, align="L")
         self.ln(6)
 
     def _add_sub_divider_row(
@@ -899,22 +986,19 @@ class SciotoComparisonPDF(FPDF):
         label_w: float,
         data_col_w: float,
         x_start: float,
-        font_size: float,
-        current_policy: Optional[CurrentPolicy],
-        carriers: list[CarrierBundle]
+        font_size: float
     ):
-        """Lighter sub-header for DWELLING 1 / DWELLING 2 labels."""
+        """Lighter sub-header for DWELLING 1 / DWELLING 2 labels. title is a _TITLE_* constant."""
         self._ensure_space(7)
         y = self.get_y()
 
-        num_data_cols = len(carriers) + (1 if current_policy else 0)
-        total_w = label_w + num_data_cols * data_col_w
+        total_w = label_w + self._num_data_cols * data_col_w
 
         self.set_fill_color(*BRAND["primary_light"])
         self.set_text_color(*BRAND["white"])
         self.set_font(self.font_family_name, "B", font_size - 1)
         self.set_xy(x_start, y)
-        self.cell(total_w, 5, _sanitize_text(f"  {title}"), border=1, fill=True, align="L")
+        self._raw_cell(total_w, 5, title, border=1, fill=True, align="L")
         self.ln(5)
 
     def _add_data_row(
@@ -929,7 +1013,10 @@ class SciotoComparisonPDF(FPDF):
         row_h: float,
         current_policy: Optional[CurrentPolicy]
     ):
-        """Single data row with alternating background and Current column styling."""
+        """Single data row with alternating background and Current column styling.
+
+        values come from the _extract_*_row helpers, which return sanitized text.
+        """
         self._ensure_space(row_h + 2)
         y = self.get_y()
         is_alt = row_idx % 2 == 0
@@ -940,57 +1027,37 @@ class SciotoComparisonPDF(FPDF):
         self.set_text_color(*BRAND["text_dark"])
         self.set_font(self.font_family_name, "", font_size)
         self.set_xy(x_start, y)
-        self.cell(label_col_w, row_h, _sanitize_text(f"  {label}"), border="LBR", fill=True, align="L")
+        self._raw_cell(label_col_w, row_h, _sanitize_text(f"  {label}"), border="LBR", fill=True, align="L")
 
-        # Data cells (Current + Carriers)
-        for i, val in enumerate(values):
-            x = x_start + label_col_w + i * data_col_w
-            self.set_xy(x, y)
+        # Data cells (Current + Carriers). Font and text color carry over from
+        # the label cell; only the fill differs for the Current column.
+        set_xy = self.set_xy
+        raw_cell = self._raw_cell
+        col_xs = self._col_xs
+        first_carrier = 0
 
-            # First value is Current Policy if it exists
-            if i == 0 and current_policy:
-                self.set_fill_color(*BRAND["current_bg"])
-            else:
-                self.set_fill_color(*bg)
+        # First value is Current Policy if it exists — drawn on its own so
+        # the carrier loop below has no per-cell branch
+        if current_policy:
+            set_xy(col_xs[0], y)
+            self.set_fill_color(*BRAND["current_bg"])
+            raw_cell(data_col_w, row_h, values[0], border="LBR", fill=True, align="C")
+            self.set_fill_color(*bg)
+            first_carrier = 1
 
-            self.set_font(self.font_family_name, "", font_size)
-            self.set_text_color(*BRAND["text_dark"])
-            self.cell(data_col_w, row_h, _sanitize_text(val), border="LBR", fill=True, align="C")
+        for i in range(first_carrier, len(values)):
+            set_xy(col_xs[i], y)
+            raw_cell(data_col_w, row_h, values[i], border="LBR", fill=True, align="C")
 
         self.ln(row_h)
 
-    @staticmethod
-    def _fmt_currency(value) -> str:
-        if value is None:
-            return "-"  # Simple dash for consistency with Sheets
-        try:
-            v = float(value)
-            if v >= 1000:
-                return f"${v:,.0f}"
-            else:
-                return f"${v:,.2f}"
-        except (ValueError, TypeError):
-            return _sanitize_text(str(value))
-
     def add_endorsements_section(self, carriers: list[CarrierBundle]):
         """List endorsements and discounts per carrier."""
         self.ln(4)
         self.add_section_title("Endorsements & Discounts")
 
         for bundle in carriers:
-            # Collect endorsements and discounts from all policies in bundle
-            all_endorsements = []
-            all_discounts = []
-
-            for policy_type in ["home", "home_2", "auto", "umbrella"]:
-                quote = getattr(bundle, policy_type)
-                if quote:
-                    all_endorsements.extend(quote.endorsements)
-                    all_discounts.extend(quote.discounts_applied)
-
-            # Deduplicate
-            all_endorsements = list(dict.fromkeys(all_endorsements))
-            all_discounts = list(dict.fromkeys(all_discounts))
+            endorsements, discounts = _collect_endorsements_discounts(bundle)
 
             self._ensure_space(18)
 
@@ -1000,22 +1067,21 @@ class SciotoComparisonPDF(FPDF):
             self.cell(0, 6, _sanitize_text(bundle.carrier_name))
             self.ln(6)
 
-            if all_endorsements:
-                self.set_font(self.font_family_name, "I", 7)
-                self.set_text_color(*BRAND["text_medium"])
-                self.cell(0, 4, _sanitize_text("Endorsements:  " + ", ".join(all_endorsements)))
-                self.ln(4)
-            else:
-                self.set_font(self.font_family_name, "I", 7)
+            self.set_font(self.font_family_name, "I", 7)
+            if not endorsements:
                 self.set_text_color(*BRAND["text_light"])
-                self.cell(0, 4, _sanitize_text("No endorsements listed"))
+                self.cell(0, 4, "No endorsements listed")
                 self.ln(4)
 
-            if all_discounts:
-                self.set_font(self.font_family_name, "I", 7)
+            # Endorsements and discounts share a style — draw them as one block
+            lines = []
+            if endorsements:
+                lines.append("Endorsements:  " + endorsements)
+            if discounts:
+                lines.append("Discounts:  " + discounts)
+            if lines:
                 self.set_text_color(*BRAND["text_medium"])
-                self.cell(0, 4, _sanitize_text("Discounts:  " + ", ".join(all_discounts)))
-                self.ln(4)
+                self.multi_cell(0, 4, _sanitize_text("\n".join(lines)))
 
             self.ln(3)
 
@@ -1027,13 +1093,9 @@ class SciotoComparisonPDF(FPDF):
         """Two-part notes section: per-carrier AI notes + optional agent notes."""
 
         # Part A: Per-carrier notes (from InsuranceQuote.notes)
-        carrier_notes_exist = False
-        for bundle in carriers:
-            for policy_type in ["home", "home_2", "auto", "umbrella"]:
-                quote = getattr(bundle, policy_type)
-                if quote and quote.notes:
-                    carrier_notes_exist = True
-                    break
+        carrier_notes_exist = any(
+            quote.notes for bundle in carriers for _, quote in _bundle_quotes(bundle)
+        )
 
         if carrier_notes_exist:
             self.ln(2)
@@ -1041,13 +1103,11 @@ class SciotoComparisonPDF(FPDF):
 
             for bundle in carriers:
                 # Collect notes from all policies in bundle
-                notes_list = []
-                for policy_type in ["home", "home_2", "auto", "umbrella"]:
-                    quote = getattr(bundle, policy_type)
-                    if quote and quote.notes:
-                        clean_note = _strip_bracket_tag(quote.notes)
-                        display_label = "Home 2" if policy_type == "home_2" else policy_type.title()
-                        notes_list.append(f"{display_label}: {clean_note}")
+                notes_list = [
+                    f"{display_label}: {_strip_bracket_tag(quote.notes)}"
+                    for display_label, quote in _bundle_quotes(bundle)
+                    if quote.notes
+                ]
 
                 if notes_list:
                     self._ensure_space(10)
@@ -1073,25 +1133,23 @@ class SciotoComparisonPDF(FPDF):
 # ──────────────────────────────────────────────
 # Public API
 # ──────────────────────────────────────────────
-def generate_comparison_pdf(
+def render_comparison_pdf(
     session: ComparisonSession,
-    output_path: str,
     logo_path: Optional[str] = None,
     date_str: Optional[str] = None,
     agent_notes: Optional[str] = None,
-) -> str:
+) -> bytes:
     """
-    Generate a branded comparison PDF from a ComparisonSession.
+    Render a branded comparison PDF from a ComparisonSession in memory.
 
     Args:
         session: ComparisonSession with current_policy, carriers, sections_included
-        output_path: Where to save the PDF
         logo_path: Path to agency logo PNG (optional)
         date_str: Override date string (default: session.date)
         agent_notes: General agent notes (optional, separate from per-carrier notes)
 
     Returns:
-        The output_path for chaining
+        The PDF document bytes
     """
     # Validate carriers
     if not session.carriers or len(session.carriers) > 6:
@@ -1102,7 +1160,7 @@ def generate_comparison_pdf(
     layout = _get_layout(len(session.carriers), has_current)
 
     # Initialize PDF
-    pdf = SciotoComparisonPDF(logo_path=logo_path, orientation=layout["orientation"])
+    pdf = SciotoComparisonPDF(logo_path=logo_path, orientation=layout.orientation)
     pdf.alias_nb_pages()
     pdf.add_page()
 
@@ -1119,7 +1177,32 @@ def generate_comparison_pdf(
     # Notes (two-part)
     pdf.add_notes_section(session.carriers, agent_notes)
 
+    return bytes(pdf.output())
+
+
+def generate_comparison_pdf(
+    session: ComparisonSession,
+    output_path: str,
+    logo_path: Optional[str] = None,
+    date_str: Optional[str] = None,
+    agent_notes: Optional[str] = None,
+) -> str:
+    """
+    Generate a branded comparison PDF from a ComparisonSession and save it.
+
+    Args:
+        session: ComparisonSession with current_policy, carriers, sections_included
+        output_path: Where to save the PDF
+        logo_path: Path to agency logo PNG (optional)
+        date_str: Override date string (default: session.date)
+        agent_notes: General agent notes (optional, separate from per-carrier notes)
+
+    Returns:
+        The output_path for chaining
+    """
+    pdf_bytes = render_comparison_pdf(session, logo_path, date_str, agent_notes)
+
     # Save
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    pdf.output(output_path)
+    Path(output_path).write_bytes(pdf_bytes)
     return output_path
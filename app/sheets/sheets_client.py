@@ -1,14 +1,17 @@
 """Google Sheets integration for insurance quote comparison output."""
 
 import logging
+import random
+import threading
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Callable, Optional
+from typing import Any, ClassVar, Optional
 
 import gspread
 from gspread.exceptions import APIError, SpreadsheetNotFound
+from gspread.http_client import BackOffHTTPClient
 
 from app.extraction.models import (
-    CarrierBundle,
     ComparisonSession,
     CurrentPolicy,
     InsuranceQuote,
@@ -62,6 +65,11 @@ LABEL_COL_WIDTH: int = 140
 DATA_COL_WIDTH: int = 120
 
 
+# (startRowIndex, endRowIndex, startColumnIndex, endColumnIndex) — 0-based,
+# end-exclusive, matching the Sheets API GridRange fields
+GridBounds = tuple[int, int, int, int]
+
+
 @dataclass
 class GridConfig:
     """Dynamic layout config computed alongside grid rows."""
@@ -71,18 +79,107 @@ class GridConfig:
     currency_rows: list[int] = field(default_factory=list)
     total_row: int = 0
     even_data_rows: list[int] = field(default_factory=list)
-    current_col_ranges: list[str] = field(default_factory=list)
-    border_range: str = ""
-    data_align_range: str = ""
-    label_align_range: str = ""
+    current_col_ranges: list[GridBounds] = field(default_factory=list)
+    border_range: GridBounds = (0, 0, 0, 0)
+    data_align_range: GridBounds = (0, 0, 0, 0)
+    label_align_range: GridBounds = (0, 0, 0, 0)
+
+
+# Grid row keys, named after the CurrentPolicy fields they compare against
+_HOME_FIELDS: tuple[tuple[str, str], ...] = (
+    ("Dwelling", "dwelling"),
+    ("Other Structures", "other_structures"),
+    ("Liability", "liability"),
+    ("Personal Property", "personal_property"),
+    ("Loss of Use", "loss_of_use"),
+    ("Deductible", "deductible"),
+)
+_AUTO_ROWS: tuple[tuple[str, str], ...] = (
+    ("Limits", "auto_limits"),
+    ("UM/UIM", "auto_um_uim"),
+    ("Comprehensive", "auto_comp_deductible"),
+    ("Collision", "auto_collision_deductible"),
+)
+_UMBRELLA_ROWS: tuple[tuple[str, str], ...] = (
+    ("Limits", "umbrella_limits"),
+    ("Deductible", "umbrella_deductible"),
+)
+_CURRENT_KEYS: tuple[str, ...] = (
+    "auto_premium", "home_premium", "home_2_premium", "umbrella_premium",
+    "total_premium",
+    *(f"{prefix}{key}" for prefix in ("home_", "home_2_") for _, key in _HOME_FIELDS),
+    *(key for _, key in _AUTO_ROWS),
+    *(key for _, key in _UMBRELLA_ROWS),
+)
+
+
+def _cell_data(value: Any) -> dict:
+    """Convert a grid value to Sheets API CellData (raw, not parsed as input).
+
+    Blank strings become empty CellData — the target worksheet is new, so
+    there is nothing to overwrite and no value needs to be sent.
+    """
+    if value == "":
+        return {}
+    if isinstance(value, str):
+        return {"userEnteredValue": {"stringValue": value}}
+    return {"userEnteredValue": {"numberValue": value}}
+
+
+def _grid_range(sheet_id: int, bounds: GridBounds) -> dict:
+    """Build a GridRange dict so ranges skip A1 parsing entirely."""
+    start_row, end_row, start_col, end_col = bounds
+    return {
+        "sheetId": sheet_id,
+        "startRowIndex": start_row,
+        "endRowIndex": end_row,
+        "startColumnIndex": start_col,
+        "endColumnIndex": end_col,
+    }
+
+
+def _repeat_cell(grid_range: dict, cell_format: dict) -> dict:
+    """Build a repeatCell request applying cell_format's keys over grid_range.
+
+    Mirrors gspread's Worksheet.batch_format so rules layer the same way.
+    """
+    return {
+        "repeatCell": {
+            "range": grid_range,
+            "cell": {"userEnteredFormat": cell_format},
+            "fields": f"userEnteredFormat({','.join(cell_format)})",
+        },
+    }
+
+
+def _fetch_titles(spreadsheet: gspread.Spreadsheet) -> set[str]:
+    """Fetch only the worksheet titles from spreadsheet metadata."""
+    metadata = spreadsheet.fetch_sheet_metadata(
+        params={"fields": "sheets.properties.title"}
+    )
+    return {sheet["properties"]["title"] for sheet in metadata.get("sheets", [])}
+
+
+def _new_sheet_id() -> int:
+    """Pick a sheetId for addSheet so later requests in the batch can use it.
+
+    Any non-negative int32 not already in the spreadsheet is accepted; a
+    random one makes collisions with existing tabs vanishingly unlikely.
+    """
+    return random.randint(1, 2**31 - 1)
+
+
+def _is_duplicate_title_error(exc: APIError) -> bool:
+    """True if addSheet failed because a tab with that title already exists."""
+    return exc.response.status_code == 400 and "already exists" in str(exc)
 
 
 def _has_multi_dwelling(session: ComparisonSession) -> bool:
     """Detect if session has multi-dwelling data."""
     cp = session.current_policy
-    if cp and cp.home_2_premium:
-        return True
-    return any(c.home_2 is not None for c in session.carriers)
+    return bool(cp and cp.home_2_premium) or any(
+        c.home_2 is not None for c in session.carriers
+    )
 
 
 # ============================================================================
@@ -95,10 +192,20 @@ class SheetsClient:
 
     Transforms a ComparisonSession into a dynamic Google Sheets layout:
     25 rows for single-dwelling, 34 rows for multi-dwelling.
+
+    The authorized gspread client, opened spreadsheet and worksheet title
+    cache are shared by all instances, so creating a client per export
+    reuses one HTTP session (keep-alive, cached token) after the first.
     """
 
+    _connect_lock: ClassVar[threading.Lock] = threading.Lock()
+    _titles_lock: ClassVar[threading.Lock] = threading.Lock()
+    _gc: ClassVar[Optional[gspread.Client]] = None
+    _spreadsheet: ClassVar[Optional[gspread.Spreadsheet]] = None
+    _known_titles: ClassVar[set[str]] = set()
+
     def __init__(self) -> None:
-        """Authenticate and open spreadsheet.
+        """Reuse the shared connection, authenticating on first use.
 
         Raises:
             SpreadsheetNotFoundError: SPREADSHEET_ID not found
@@ -106,8 +213,25 @@ class SheetsClient:
             QuotaExceededError: API quota exceeded
             SheetsClientError: Service account credentials not found
         """
+        with SheetsClient._connect_lock:
+            if SheetsClient._spreadsheet is None:
+                SheetsClient._connect()
+        self.gc = SheetsClient._gc
+        self.spreadsheet = SheetsClient._spreadsheet
+
+    @classmethod
+    def _connect(cls) -> None:
+        """Authenticate, open the spreadsheet and cache its worksheet titles.
+
+        Raises:
+            Same as __init__.
+        """
         try:
-            self.gc = gspread.service_account(filename=GOOGLE_SERVICE_ACCOUNT_FILE)
+            # BackOffHTTPClient retries 429/5xx responses with exponential backoff
+            gc = gspread.service_account(
+                filename=GOOGLE_SERVICE_ACCOUNT_FILE,
+                http_client=BackOffHTTPClient,
+            )
             logger.info("Authenticated with Google Sheets API")
         except FileNotFoundError as exc:
             raise SheetsClientError(
@@ -115,8 +239,10 @@ class SheetsClient:
             ) from exc
 
         try:
-            self.spreadsheet = self.gc.open_by_key(SPREADSHEET_ID)
-            logger.info("Opened spreadsheet: %s", self.spreadsheet.title)
+            spreadsheet = gc.open_by_key(SPREADSHEET_ID)
+            logger.info("Opened spreadsheet: %s", spreadsheet.title)
+            # Worksheet titles cached for unique-name checks (see refresh_titles)
+            titles = _fetch_titles(spreadsheet)
         except SpreadsheetNotFound as exc:
             raise SpreadsheetNotFoundError(
                 f"Spreadsheet {SPREADSHEET_ID} not found. "
@@ -134,6 +260,20 @@ class SheetsClient:
                 ) from exc
             raise SheetsClientError(f"API error during spreadsheet access: {exc}") from exc
 
+        with cls._titles_lock:
+            cls._known_titles = titles
+        cls._gc, cls._spreadsheet = gc, spreadsheet
+
+    def refresh_titles(self) -> None:
+        """Reload the cached worksheet titles from the spreadsheet.
+
+        The cache is updated as worksheets are added; call this if other
+        users or processes may have added or renamed tabs since.
+        """
+        titles = _fetch_titles(self.spreadsheet)
+        with SheetsClient._titles_lock:
+            SheetsClient._known_titles = titles
+
     def create_comparison(self, session: ComparisonSession) -> str:
         """Create comparison worksheet from session data.
 
@@ -157,39 +297,29 @@ class SheetsClient:
             num_data_cols = self._get_num_data_columns(session)
 
             # 1. Build full grid and dynamic layout config
-            grid, config = self._build_full_grid(session, num_data_cols)
+            rows, config = self._build_full_grid(session, num_data_cols)
+
+            # 2. Values, logo, formatting, widths and merges for the new sheet.
+            #    The sheetId is chosen here so these can reference the sheet
+            #    in the same batch that creates it.
+            sheet_id = _new_sheet_id()
+            content_requests = [self._build_values_request(sheet_id, rows)]
+            content_requests.extend(self._build_format_requests(
+                sheet_id, num_data_cols, config,
+                has_current_policy=session.current_policy is not None,
+            ))
 
-            # 2. Create blank worksheet with dynamic row count
-            new_ws = self._create_worksheet(
+            # 3. addSheet + content in one round trip
+            self._create_worksheet(
                 session.client_name, session.date, num_data_cols,
+                sheet_id, content_requests,
                 total_rows=config.total_rows,
             )
 
-            # 3. Write to worksheet at A1
-            self._write_to_worksheet(new_ws, grid)
-
-            # 4. Apply formatting using dynamic config
-            self._apply_formatting(
-                new_ws, num_data_cols, config,
-                has_current_policy=session.current_policy is not None,
-            )
-
-            # 5. Insert logo into merged A1:A2 (if configured)
-            if LOGO_DRIVE_FILE_ID:
-                logo_url = (
-                    f"https://drive.google.com/uc?id={LOGO_DRIVE_FILE_ID}"
-                )
-                new_ws.update(
-                    [[f'=IMAGE("{logo_url}",2)']],
-                    "A1",
-                    value_input_option="USER_ENTERED",
-                )
-                logger.info("Inserted logo formula into A1")
-
-            # 6. Construct URL
+            # 4. Construct URL
             url = (
                 f"https://docs.google.com/spreadsheets/d/"
-                f"{SPREADSHEET_ID}/edit#gid={new_ws.id}"
+                f"{SPREADSHEET_ID}/edit#gid={sheet_id}"
             )
 
             logger.info("Comparison created: %s", url)
@@ -277,313 +407,66 @@ class SheetsClient:
         return "-"
 
     # ========================================================================
-    # Row Building Helpers
+    # Value Extraction (one pass over carriers)
     # ========================================================================
 
-    def _build_premium_row(
-        self,
-        session: ComparisonSession,
-        current_getter: Callable[[CurrentPolicy], Optional[float]],
-        carrier_getter: Callable[[CarrierBundle], Optional[float]]
-    ) -> list[Any]:
-        """Build a premium row (auto/home/umbrella).
-
-        Args:
-            session: Comparison session
-            current_getter: Lambda to extract current policy value
-            carrier_getter: Lambda to extract carrier bundle value
-
-        Returns:
-            Row with 7 cells (Column B + Columns C-H)
-        """
-        row = []
-
-        # Column B: Current Policy
-        if session.current_policy:
-            value = current_getter(session.current_policy)
-            row.append(self._format_cell_value(value))
-        else:
-            row.append("-")
-
-        # Columns C-H: Carriers (up to 6)
-        for carrier in session.carriers[:6]:
-            value = carrier_getter(carrier)
-            row.append(self._format_cell_value(value))
-
-        # Pad remaining columns to reach 7 total
-        while len(row) < 7:
-            row.append("")
-
-        return row
-
-    def _build_total_row(self, session: ComparisonSession) -> list[Any]:
-        """Build row 7 (Total premium - sum of auto/home/umbrella).
-
-        Args:
-            session: Comparison session
-
-        Returns:
-            Row with 7 cells containing total premiums
-        """
-        row = []
-
-        # Column B: Current Policy total
-        if session.current_policy:
-            row.append(self._format_cell_value(session.current_policy.total_premium))
-        else:
-            row.append("-")
-
-        # Columns C-H: Carrier totals
-        for carrier in session.carriers[:6]:
-            row.append(self._format_cell_value(carrier.total_premium))
-
-        # Pad
-        while len(row) < 7:
-            row.append("")
-
-        return row
-
-    def _build_home_section(self, session: ComparisonSession) -> list[list[Any]]:
-        """Build rows 10-15 (Home coverage details).
-
-        Args:
-            session: Comparison session
-
-        Returns:
-            6 rows for dwelling, other structures, liability, personal property,
-            loss of use, and deductible
-        """
-        return [
-            # Row 10: Dwelling
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_dwelling,
-                lambda cb: cb.home.coverage_limits.dwelling if cb.home else None
-            ),
-            # Row 11: Other Structures
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_other_structures,
-                lambda cb: cb.home.coverage_limits.other_structures if cb.home else None
-            ),
-            # Row 12: Liability
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_liability,
-                lambda cb: cb.home.coverage_limits.personal_liability if cb.home else None
-            ),
-            # Row 13: Personal Property
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_personal_property,
-                lambda cb: cb.home.coverage_limits.personal_property if cb.home else None
-            ),
-            # Row 14: Loss of Use
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_loss_of_use,
-                lambda cb: cb.home.coverage_limits.loss_of_use if cb.home else None
-            ),
-            # Row 15: Deductible
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_deductible,
-                lambda cb: cb.home.deductible if cb.home else None
-            ),
-        ]
-
-    def _build_home_2_section(self, session: ComparisonSession) -> list[list[Any]]:
-        """Build Dwelling 2 home coverage rows.
-
-        Args:
-            session: Comparison session
-
-        Returns:
-            6 rows for dwelling, other structures, liability, personal property,
-            loss of use, and deductible (Dwelling 2)
-        """
-        return [
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_2_dwelling,
-                lambda cb: cb.home_2.coverage_limits.dwelling if cb.home_2 else None
-            ),
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_2_other_structures,
-                lambda cb: cb.home_2.coverage_limits.other_structures if cb.home_2 else None
-            ),
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_2_liability,
-                lambda cb: cb.home_2.coverage_limits.personal_liability if cb.home_2 else None
-            ),
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_2_personal_property,
-                lambda cb: cb.home_2.coverage_limits.personal_property if cb.home_2 else None
-            ),
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_2_loss_of_use,
-                lambda cb: cb.home_2.coverage_limits.loss_of_use if cb.home_2 else None
-            ),
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.home_2_deductible,
-                lambda cb: cb.home_2.deductible if cb.home_2 else None
-            ),
-        ]
-
-    def _build_auto_section(self, session: ComparisonSession) -> list[list[Any]]:
-        """Build auto coverage detail rows.
-
-        Args:
-            session: Comparison session
-
-        Returns:
-            4 rows for limits, UM/UIM, comp deductible, collision deductible
-        """
-        return [
-            # Row 18: Limits (special formatting)
-            self._build_auto_limits_row(session),
-            # Row 19: UM/UIM
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.auto_um_uim,
-                lambda cb: cb.auto.coverage_limits.um_uim if cb.auto else None
-            ),
-            # Row 20: Comprehensive Deductible
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.auto_comp_deductible,
-                lambda cb: cb.auto.coverage_limits.comprehensive if cb.auto else None
-            ),
-            # Row 21: Collision Deductible
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.auto_collision_deductible,
-                lambda cb: cb.auto.deductible if cb.auto else None
-            ),
-        ]
-
-    def _build_umbrella_section(self, session: ComparisonSession) -> list[list[Any]]:
-        """Build rows 24-25 (Umbrella coverage details).
+    def _extract_current_values(self, current: CurrentPolicy) -> dict[str, Any]:
+        """Format every row value for the Current Policy column.
 
         Args:
-            session: Comparison session
+            current: Client's current policy
 
         Returns:
-            2 rows for limits and deductible
+            Dict keyed like the CurrentPolicy fields used by the grid
         """
-        return [
-            # Row 24: Limits
-            self._build_umbrella_limits_row(session),
-            # Row 25: Deductible
-            self._build_coverage_row(
-                session,
-                lambda cp: cp.umbrella_deductible,
-                lambda cb: cb.umbrella.deductible if cb.umbrella else None
-            ),
-        ]
+        fmt = self._format_cell_value
+        values = {key: fmt(getattr(current, key)) for key in _CURRENT_KEYS}
+        # Limits are free text; an empty string still reads as missing
+        values["auto_limits"] = current.auto_limits or "-"
+        values["umbrella_limits"] = current.umbrella_limits or "-"
+        return values
 
-    def _build_coverage_row(
-        self,
-        session: ComparisonSession,
-        current_getter: Callable[[CurrentPolicy], Any],
-        carrier_getter: Callable[[CarrierBundle], Any]
-    ) -> list[Any]:
-        """Build a coverage row (handles float, str, or None).
+    def _extract_carrier_matrix(self, session: ComparisonSession) -> dict[str, list[Any]]:
+        """Walk carriers once, collecting each row's formatted values.
 
         Args:
             session: Comparison session
-            current_getter: Lambda to extract current policy value
-            carrier_getter: Lambda to extract carrier bundle value
 
         Returns:
-            Row with 7 cells
+            Dict mapping row key to one formatted value per carrier (up to 6)
         """
-        row = []
-
-        # Column B: Current Policy
-        if session.current_policy:
-            value = current_getter(session.current_policy)
-            row.append(self._format_cell_value(value))
-        else:
-            row.append("-")
+        fmt = self._format_cell_value
+        matrix: dict[str, list[Any]] = defaultdict(list)
 
-        # Columns C-H: Carriers
         for carrier in session.carriers[:6]:
-            value = carrier_getter(carrier)
-            row.append(self._format_cell_value(value))
-
-        # Pad
-        while len(row) < 7:
-            row.append("")
-
-        return row
-
-    def _build_auto_limits_row(self, session: ComparisonSession) -> list[Any]:
-        """Build auto limits row (Row 18) - special formatting.
-
-        Args:
-            session: Comparison session
-
-        Returns:
-            Row with formatted auto limits like "500/500/250" or "1M CSL"
-        """
-        row = []
-
-        # Column B: Current Policy
-        if session.current_policy:
-            row.append(session.current_policy.auto_limits or "-")
-        else:
-            row.append("-")
-
-        # Columns C-H: Carriers
-        for carrier in session.carriers[:6]:
-            if carrier.auto:
-                limits_str = self._get_auto_limits(carrier.auto)
-                row.append(limits_str)
-            else:
-                row.append("-")
-
-        # Pad
-        while len(row) < 7:
-            row.append("")
-
-        return row
-
-    def _build_umbrella_limits_row(self, session: ComparisonSession) -> list[Any]:
-        """Build umbrella limits row (Row 24) - special formatting.
-
-        Args:
-            session: Comparison session
-
-        Returns:
-            Row with formatted umbrella limits like "1M CSL" or raw numbers
-        """
-        row = []
-
-        # Column B: Current Policy
-        if session.current_policy:
-            row.append(session.current_policy.umbrella_limits or "-")
-        else:
-            row.append("-")
-
-        # Columns C-H: Carriers
-        for carrier in session.carriers[:6]:
-            if carrier.umbrella:
-                limits_value = self._get_umbrella_limits(carrier.umbrella)
-                row.append(limits_value)
-            else:
-                row.append("-")
-
-        # Pad
-        while len(row) < 7:
-            row.append("")
-
-        return row
+            home, home_2 = carrier.home, carrier.home_2
+            auto, umbrella = carrier.auto, carrier.umbrella
+            values: dict[str, Any] = {
+                "auto_premium": auto.annual_premium if auto else None,
+                "home_premium": home.annual_premium if home else None,
+                "home_2_premium": home_2.annual_premium if home_2 else None,
+                "umbrella_premium": umbrella.annual_premium if umbrella else None,
+                "total_premium": carrier.total_premium,
+                "auto_limits": self._get_auto_limits(auto) if auto else None,
+                "auto_um_uim": auto.coverage_limits.um_uim if auto else None,
+                "auto_comp_deductible": auto.coverage_limits.comprehensive if auto else None,
+                "auto_collision_deductible": auto.deductible if auto else None,
+                "umbrella_limits": self._get_umbrella_limits(umbrella) if umbrella else None,
+                "umbrella_deductible": umbrella.deductible if umbrella else None,
+            }
+            for prefix, quote in (("home_", home), ("home_2_", home_2)):
+                cl = quote.coverage_limits if quote else None
+                values[prefix + "dwelling"] = cl.dwelling if cl else None
+                values[prefix + "other_structures"] = cl.other_structures if cl else None
+                values[prefix + "liability"] = cl.personal_liability if cl else None
+                values[prefix + "personal_property"] = cl.personal_property if cl else None
+                values[prefix + "loss_of_use"] = cl.loss_of_use if cl else None
+                values[prefix + "deductible"] = quote.deductible if quote else None
+
+            for key, value in values.items():
+                matrix[key].append(fmt(value))
+
+        return matrix
 
     # ========================================================================
     # Worksheet Operations
@@ -602,40 +485,84 @@ class SheetsClient:
 
     def _create_worksheet(
         self, client_name: str, date: str, num_data_cols: int,
+        sheet_id: int, content_requests: list[dict],
         total_rows: int = 25,
-    ) -> gspread.Worksheet:
-        """Create blank worksheet with unique name.
+    ) -> str:
+        """Create worksheet with unique name and its content in one batch_update.
+
+        The batch is applied atomically, so a failure leaves no partial tab.
 
         Args:
             client_name: Client name for worksheet title
             date: ISO date string (YYYY-MM-DD)
             num_data_cols: Number of data columns
+            sheet_id: Client-chosen sheetId the content requests target
+            content_requests: Requests to run right after addSheet
             total_rows: Number of rows (25 single-dwelling, 34 multi-dwelling)
 
         Returns:
-            New blank worksheet
+            Title of the new worksheet
         """
         base_name = f"Quote_{client_name}_{date}"
 
-        # Check for existing worksheets with same name
-        existing_names = [ws.title for ws in self.spreadsheet.worksheets()]
-
-        # Find unique name
-        worksheet_name = base_name
-        counter = 2
-        while worksheet_name in existing_names:
-            worksheet_name = f"{base_name}_{counter}"
-            counter += 1
-
-        # Create blank worksheet
-        new_ws = self.spreadsheet.add_worksheet(
-            title=worksheet_name,
-            rows=total_rows,
-            cols=1 + num_data_cols,
+        # The title cache only knows tabs this process created. If a tab with
+        # the chosen name was made elsewhere, reload the titles and retry once.
+        for attempt in range(2):
+            worksheet_name = self._reserve_title(base_name)
+            add_sheet = {
+                "addSheet": {
+                    "properties": {
+                        "sheetId": sheet_id,
+                        "title": worksheet_name,
+                        "gridProperties": {
+                            "rowCount": total_rows,
+                            "columnCount": 1 + num_data_cols,
+                        },
+                    },
+                },
+            }
+            try:
+                self.spreadsheet.batch_update(
+                    {"requests": [add_sheet, *content_requests]}
+                )
+                break
+            except APIError as exc:
+                with SheetsClient._titles_lock:
+                    SheetsClient._known_titles.discard(worksheet_name)
+                if attempt or not _is_duplicate_title_error(exc):
+                    raise
+                logger.warning(
+                    "Worksheet %s already exists; refreshing cached titles",
+                    worksheet_name,
+                )
+                self.refresh_titles()
+
+        logger.info(
+            "Created worksheet %s (%d rows) with %d requests",
+            worksheet_name, total_rows, 1 + len(content_requests),
         )
+        return worksheet_name
+
+    def _reserve_title(self, base_name: str) -> str:
+        """Pick and reserve a title not in the cached titles (no API call).
+
+        The cache is shared, so concurrent exports can't pick the same name.
 
-        logger.info("Created worksheet: %s (%d rows)", worksheet_name, total_rows)
-        return new_ws
+        Args:
+            base_name: Preferred title; "_2", "_3", ... is appended if taken
+
+        Returns:
+            Reserved worksheet title
+        """
+        with SheetsClient._titles_lock:
+            known_titles = SheetsClient._known_titles
+            worksheet_name = base_name
+            counter = 2
+            while worksheet_name in known_titles:
+                worksheet_name = f"{base_name}_{counter}"
+                counter += 1
+            known_titles.add(worksheet_name)
+        return worksheet_name
 
     # ========================================================================
     # Main Grid Builder
@@ -643,17 +570,19 @@ class SheetsClient:
 
     def _build_full_grid(
         self, session: ComparisonSession, num_data_cols: int
-    ) -> tuple[list[list[Any]], GridConfig]:
+    ) -> tuple[list[dict], GridConfig]:
         """Build dynamic grid with labels, headers, and data.
 
         Returns 25 rows for single-dwelling, 34 rows for multi-dwelling.
+        Rows are emitted directly as Sheets API RowData, ready for
+        updateCells, rather than as an intermediate list of lists.
 
         Args:
             session: Comparison session
             num_data_cols: Number of data columns
 
         Returns:
-            Tuple of (grid rows, GridConfig with layout metadata)
+            Tuple of (RowData rows, GridConfig with layout metadata)
         """
         total_cols = 1 + num_data_cols
         is_multi_dw = _has_multi_dwelling(session)
@@ -661,17 +590,18 @@ class SheetsClient:
         data_blocks: list[tuple[int, int]] = []
         row_num = 0
 
-        def pad_row(helper_row: list[Any]) -> list[Any]:
-            """Trim helper row to num_data_cols, stripping current col if needed."""
-            if not session.current_policy:
-                data = helper_row[1:]  # Skip leading "-" (no current policy column)
-            else:
-                data = helper_row
-            return (data + [""] * num_data_cols)[:num_data_cols]
+        # Extract every value up front: one pass over the carriers
+        current = (
+            self._extract_current_values(session.current_policy)
+            if session.current_policy
+            else None
+        )
+        matrix = self._extract_carrier_matrix(session)
 
-        def label_row(label: str, helper_row: list[Any]) -> list[Any]:
-            """Prepend row label to trimmed helper row."""
-            return [label] + pad_row(helper_row)
+        def label_row(label: str, key: str) -> list[Any]:
+            """Row label + current value (if any) + carrier values, padded."""
+            values = ([current[key]] if current else []) + matrix[key]
+            return [label] + values[:num_data_cols] + [""] * (num_data_cols - len(values))
 
         def empty_row() -> list[Any]:
             return [""] * total_cols
@@ -679,11 +609,18 @@ class SheetsClient:
         def section_header(label: str) -> list[Any]:
             return [label] + [""] * num_data_cols
 
-        grid: list[list[Any]] = []
+        rows: list[dict] = []
+
+        def add_row(row: list[Any]) -> None:
+            """Append row as RowData, dropping its trailing blank cells."""
+            end = len(row)
+            while end and row[end - 1] == "":
+                end -= 1
+            rows.append({"values": [_cell_data(value) for value in row[:end]]})
 
         # Row 1: Title (A1:A2 reserved for logo)
         row_num += 1
-        grid.append(
+        add_row(
             ["", f"Quote Comparison \u2014 {session.client_name}"]
             + [""] * max(0, num_data_cols - 1)
         )
@@ -691,7 +628,7 @@ class SheetsClient:
 
         # Row 2: Date (B2, A2 is part of logo merge)
         row_num += 1
-        grid.append(["", session.date] + [""] * max(0, num_data_cols - 1))
+        add_row(["", session.date] + [""] * max(0, num_data_cols - 1))
 
         # Row 3: Carrier names header
         row_num += 1
@@ -702,7 +639,7 @@ class SheetsClient:
         for carrier in session.carriers[:6]:
             carrier_header.append(carrier.carrier_name)
         carrier_header = (carrier_header + [""] * total_cols)[:total_cols]
-        grid.append(carrier_header)
+        add_row(carrier_header)
         config.header_rows.append(row_num)
 
         # === Premium Section ===
@@ -710,170 +647,126 @@ class SheetsClient:
 
         # Auto Premium
         row_num += 1
-        grid.append(label_row("Auto Premium", self._build_premium_row(
-            session,
-            lambda cp: cp.auto_premium,
-            lambda cb: cb.auto.annual_premium if cb.auto else None
-        )))
+        add_row(label_row("Auto Premium", "auto_premium"))
         config.currency_rows.append(row_num)
 
         # Home Premium(s)
         if is_multi_dw:
             row_num += 1
-            grid.append(label_row("Home 1 Premium", self._build_premium_row(
-                session,
-                lambda cp: cp.home_premium,
-                lambda cb: cb.home.annual_premium if cb.home else None
-            )))
+            add_row(label_row("Home 1 Premium", "home_premium"))
             config.currency_rows.append(row_num)
 
             row_num += 1
-            grid.append(label_row("Home 2 Premium", self._build_premium_row(
-                session,
-                lambda cp: cp.home_2_premium,
-                lambda cb: cb.home_2.annual_premium if cb.home_2 else None
-            )))
+            add_row(label_row("Home 2 Premium", "home_2_premium"))
             config.currency_rows.append(row_num)
         else:
             row_num += 1
-            grid.append(label_row("Home Premium", self._build_premium_row(
-                session,
-                lambda cp: cp.home_premium,
-                lambda cb: cb.home.annual_premium if cb.home else None
-            )))
+            add_row(label_row("Home Premium", "home_premium"))
             config.currency_rows.append(row_num)
 
         # Umbrella Premium
         row_num += 1
-        grid.append(label_row("Umbrella Premium", self._build_premium_row(
-            session,
-            lambda cp: cp.umbrella_premium,
-            lambda cb: cb.umbrella.annual_premium if cb.umbrella else None
-        )))
+        add_row(label_row("Umbrella Premium", "umbrella_premium"))
         config.currency_rows.append(row_num)
 
         # Total
         row_num += 1
-        grid.append(label_row("Total", self._build_total_row(session)))
+        add_row(label_row("Total", "total_premium"))
         config.currency_rows.append(row_num)
         config.total_row = row_num
         data_blocks.append((premium_start, row_num))
 
         # Blank separator
         row_num += 1
-        grid.append(empty_row())
+        add_row(empty_row())
 
         # === Home Coverage Section ===
         row_num += 1
-        grid.append(section_header("Home Coverage"))
+        add_row(section_header("Home Coverage"))
         config.header_rows.append(row_num)
 
-        home_labels = [
-            "Dwelling", "Other Structures", "Liability",
-            "Personal Property", "Loss of Use", "Deductible",
-        ]
-        home_data = (
-            self._build_home_section(session)
-            if "home" in session.sections_included
-            else None
-        )
+        home_included = "home" in session.sections_included
 
         if is_multi_dw:
-            home_2_data = (
-                self._build_home_2_section(session)
-                if "home" in session.sections_included
-                else None
-            )
-
             # Dwelling 1 sub-header
             row_num += 1
-            grid.append(section_header("Dwelling 1"))
+            add_row(section_header("Dwelling 1"))
             config.sub_header_rows.append(row_num)
 
             # Dwelling 1 data rows
             dw1_start = row_num + 1
-            for i, label in enumerate(home_labels):
+            for label, key in _HOME_FIELDS:
                 row_num += 1
-                if home_data:
-                    grid.append(label_row(label, home_data[i]))
+                if home_included:
+                    add_row(label_row(label, "home_" + key))
                 else:
-                    grid.append([label] + [""] * num_data_cols)
+                    add_row([label] + [""] * num_data_cols)
                 config.currency_rows.append(row_num)
             data_blocks.append((dw1_start, row_num))
 
             # Dwelling 2 sub-header
             row_num += 1
-            grid.append(section_header("Dwelling 2"))
+            add_row(section_header("Dwelling 2"))
             config.sub_header_rows.append(row_num)
 
             # Dwelling 2 data rows
             dw2_start = row_num + 1
-            for i, label in enumerate(home_labels):
+            for label, key in _HOME_FIELDS:
                 row_num += 1
-                if home_2_data:
-                    grid.append(label_row(label, home_2_data[i]))
+                if home_included:
+                    add_row(label_row(label, "home_2_" + key))
                 else:
-                    grid.append([label] + [""] * num_data_cols)
+                    add_row([label] + [""] * num_data_cols)
                 config.currency_rows.append(row_num)
             data_blocks.append((dw2_start, row_num))
         else:
             # Single-dwelling: 6 data rows
             home_start = row_num + 1
-            for i, label in enumerate(home_labels):
+            for label, key in _HOME_FIELDS:
                 row_num += 1
-                if home_data:
-                    grid.append(label_row(label, home_data[i]))
+                if home_included:
+                    add_row(label_row(label, "home_" + key))
                 else:
-                    grid.append([label] + [""] * num_data_cols)
+                    add_row([label] + [""] * num_data_cols)
                 config.currency_rows.append(row_num)
             data_blocks.append((home_start, row_num))
 
         # Blank separator
         row_num += 1
-        grid.append(empty_row())
+        add_row(empty_row())
 
         # === Auto Coverage Section ===
         row_num += 1
-        grid.append(section_header("Auto Coverage"))
+        add_row(section_header("Auto Coverage"))
         config.header_rows.append(row_num)
 
-        auto_labels = ["Limits", "UM/UIM", "Comprehensive", "Collision"]
-        auto_data = (
-            self._build_auto_section(session)
-            if "auto" in session.sections_included
-            else None
-        )
+        auto_included = "auto" in session.sections_included
         auto_start = row_num + 1
-        for i, label in enumerate(auto_labels):
+        for label, key in _AUTO_ROWS:
             row_num += 1
-            if auto_data:
-                grid.append(label_row(label, auto_data[i]))
+            if auto_included:
+                add_row(label_row(label, key))
             else:
-                grid.append([label] + [""] * num_data_cols)
+                add_row([label] + [""] * num_data_cols)
         data_blocks.append((auto_start, row_num))
 
         # Blank separator
         row_num += 1
-        grid.append(empty_row())
+        add_row(empty_row())
 
         # === Umbrella Coverage Section ===
         row_num += 1
-        grid.append(section_header("Umbrella Coverage"))
+        add_row(section_header("Umbrella Coverage"))
         config.header_rows.append(row_num)
 
-        umbrella_labels = ["Limits", "Deductible"]
-        umbrella_data = (
-            self._build_umbrella_section(session)
-            if "umbrella" in session.sections_included
-            else None
-        )
+        umbrella_included = "umbrella" in session.sections_included
         umbrella_start = row_num + 1
-        for i, label in enumerate(umbrella_labels):
+        for label, key in _UMBRELLA_ROWS:
             row_num += 1
-            if umbrella_data:
-                grid.append(label_row(label, umbrella_data[i]))
+            if umbrella_included:
+                add_row(label_row(label, key))
             else:
-                grid.append([label] + [""] * num_data_cols)
+                add_row([label] + [""] * num_data_cols)
         data_blocks.append((umbrella_start, row_num))
 
         # Compute even_data_rows from data blocks
@@ -882,65 +775,87 @@ class SheetsClient:
                 if i % 2 == 0:
                     config.even_data_rows.append(row)
 
-        # Compute current_col_ranges from data blocks
+        # Compute current_col_ranges (column B) from data blocks
         for start, end in data_blocks:
-            config.current_col_ranges.append(f"B{start}:B{end}")
+            config.current_col_ranges.append((start - 1, end, 1, 2))
 
-        # Finalize config
-        last_col = chr(ord('A') + num_data_cols)
+        # Finalize config (A3:last, B4:last, A4:A-last as 0-based bounds)
         config.total_rows = row_num
-        config.border_range = f"A3:{last_col}{row_num}"
-        config.data_align_range = f"B4:{last_col}{row_num}"
-        config.label_align_range = f"A4:A{row_num}"
+        config.border_range = (2, row_num, 0, total_cols)
+        config.data_align_range = (3, row_num, 1, total_cols)
+        config.label_align_range = (3, row_num, 0, 1)
 
         logger.debug(
-            "Built grid: %d rows x %d columns", len(grid), total_cols
+            "Built grid: %d rows x %d columns", len(rows), total_cols
         )
-        return grid, config
+        return rows, config
 
     # ========================================================================
     # Write & Format
     # ========================================================================
 
-    def _write_to_worksheet(
+    def _build_values_request(
         self,
-        worksheet: gspread.Worksheet,
-        grid: list[list[Any]]
-    ) -> None:
-        """Write data grid to worksheet starting at A1.
+        sheet_id: int,
+        rows: list[dict]
+    ) -> dict:
+        """Build an updateCells request writing the rows starting at A1.
+
+        Values are stored as-is (like RAW input); only the logo cell in A1
+        is sent as a formula, replaced in rows[0] in place.
 
         Args:
-            worksheet: Target worksheet
-            grid: 25-row grid of data
+            sheet_id: Target worksheet ID
+            rows: RowData rows from _build_full_grid
+
+        Returns:
+            updateCells request for spreadsheet.batch_update()
         """
-        worksheet.update(grid, 'A1')
-        logger.info("Wrote %d rows to worksheet %s", len(grid), worksheet.title)
+        # Logo into merged A1:A2 (if configured)
+        if LOGO_DRIVE_FILE_ID:
+            logo_url = f"https://drive.google.com/uc?id={LOGO_DRIVE_FILE_ID}"
+            rows[0]["values"][0] = {
+                "userEnteredValue": {"formulaValue": f'=IMAGE("{logo_url}",2)'},
+            }
+
+        return {
+            "updateCells": {
+                "rows": rows,
+                "fields": "userEnteredValue",
+                "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+            },
+        }
 
-    def _apply_formatting(
+    def _build_format_requests(
         self,
-        worksheet: gspread.Worksheet,
+        sheet_id: int,
         num_data_cols: int,
         config: GridConfig,
         *,
         has_current_policy: bool = True,
-    ) -> None:
-        """Apply all formatting to worksheet using dynamic GridConfig.
+    ) -> list[dict]:
+        """Build all formatting requests using dynamic GridConfig.
 
-        Uses batch_format() for cell formatting and spreadsheet.batch_update()
-        for column widths and cell merges.
+        Cell formats become repeatCell requests; column widths, row heights
+        and merges are appended so everything ships in one batch_update().
 
         Args:
-            worksheet: Target worksheet
+            sheet_id: Target worksheet ID
             num_data_cols: Number of data columns
             config: Dynamic layout config from _build_full_grid
             has_current_policy: Whether column B is a current policy column
+
+        Returns:
+            Requests for spreadsheet.batch_update()
         """
-        last_col = chr(ord('A') + num_data_cols)
-        last_row = config.total_rows
-        sheet_id = worksheet.id
+        total_cols = 1 + num_data_cols
 
-        # Build format rules list
-        formats: list[dict] = []
+        def row_bounds(row: int, first_col: int = 0) -> GridBounds:
+            """Bounds of 1-based sheet row from first_col to the last data column."""
+            return (row - 1, row, first_col, total_cols)
+
+        # Build format rules list: (bounds, format) pairs
+        formats: list[tuple[GridBounds, dict]] = []
 
         # --- Maroon headers (dynamic from config) ---
         maroon_fmt = {
@@ -954,15 +869,9 @@ class SheetsClient:
         for row in config.header_rows:
             if row == 1:
                 # Title row starts at B1 (A1:A2 reserved for logo)
-                formats.append({
-                    "range": f"B1:{last_col}1",
-                    "format": maroon_fmt,
-                })
+                formats.append((row_bounds(1, first_col=1), maroon_fmt))
             else:
-                formats.append({
-                    "range": f"A{row}:{last_col}{row}",
-                    "format": maroon_fmt,
-                })
+                formats.append((row_bounds(row), maroon_fmt))
 
         # --- Sub-headers (Dwelling 1 / Dwelling 2) — slightly lighter maroon ---
         sub_header_fmt = {
@@ -974,90 +883,70 @@ class SheetsClient:
             },
         }
         for row in config.sub_header_rows:
-            formats.append({
-                "range": f"A{row}:{last_col}{row}",
-                "format": sub_header_fmt,
-            })
+            formats.append((row_bounds(row), sub_header_fmt))
 
         # --- Bold total row (dynamic from config) ---
         if config.total_row:
-            formats.append({
-                "range": f"A{config.total_row}:{last_col}{config.total_row}",
-                "format": {"textFormat": {"bold": True}},
-            })
+            formats.append((
+                row_bounds(config.total_row),
+                {"textFormat": {"bold": True}},
+            ))
 
         # --- Currency formatting (dynamic from config) on data columns only ---
+        currency_fmt = {
+            "numberFormat": {
+                "type": "CURRENCY",
+                "pattern": '"$"#,##0',
+            },
+        }
         for row in config.currency_rows:
-            formats.append({
-                "range": f"B{row}:{last_col}{row}",
-                "format": {
-                    "numberFormat": {
-                        "type": "CURRENCY",
-                        "pattern": '"$"#,##0',
-                    },
-                },
-            })
+            formats.append((row_bounds(row, first_col=1), currency_fmt))
 
         # --- Alternating gray shading on even data rows (dynamic from config) ---
+        gray_fmt = {"backgroundColor": LIGHT_GRAY_BG}
         for row in config.even_data_rows:
-            formats.append({
-                "range": f"A{row}:{last_col}{row}",
-                "format": {"backgroundColor": LIGHT_GRAY_BG},
-            })
+            formats.append((row_bounds(row), gray_fmt))
 
         # --- Current Policy column: cream background on data rows only
         #     (skip section headers so maroon applies uniformly) ---
         if has_current_policy:
-            for rng in config.current_col_ranges:
-                formats.append({
-                    "range": rng,
-                    "format": {"backgroundColor": CURRENT_COL_BG},
-                })
+            current_fmt = {"backgroundColor": CURRENT_COL_BG}
+            for bounds in config.current_col_ranges:
+                formats.append((bounds, current_fmt))
 
         # --- Thin borders (A3 through last row) ---
         thin_border = {
             "style": "SOLID",
             "color": {"red": 0.8, "green": 0.8, "blue": 0.8},
         }
-        formats.append({
-            "range": config.border_range,
-            "format": {
-                "borders": {
-                    "top": thin_border,
-                    "bottom": thin_border,
-                    "left": thin_border,
-                    "right": thin_border,
-                },
+        formats.append((config.border_range, {
+            "borders": {
+                "top": thin_border,
+                "bottom": thin_border,
+                "left": thin_border,
+                "right": thin_border,
             },
-        })
+        }))
 
         # --- Data alignment: center for data cols ---
-        formats.append({
-            "range": config.data_align_range,
-            "format": {"horizontalAlignment": "CENTER"},
-        })
+        formats.append((config.data_align_range, {"horizontalAlignment": "CENTER"}))
 
         # --- Label alignment: left for column A ---
-        formats.append({
-            "range": config.label_align_range,
-            "format": {"horizontalAlignment": "LEFT"},
-        })
+        formats.append((config.label_align_range, {"horizontalAlignment": "LEFT"}))
 
         # --- Date row: italic, left (B2 — A2 is part of logo merge) ---
-        formats.append({
-            "range": f"B2:{last_col}2",
-            "format": {
-                "textFormat": {"italic": True},
-                "horizontalAlignment": "LEFT",
-            },
-        })
-
-        # Apply all cell formatting in one call
-        worksheet.batch_format(formats)
-        logger.info("Applied %d format rules", len(formats))
+        formats.append((row_bounds(2, first_col=1), {
+            "textFormat": {"italic": True},
+            "horizontalAlignment": "LEFT",
+        }))
 
-        # --- Column widths + merges via raw batch_update ---
         requests: list[dict] = [
+            _repeat_cell(_grid_range(sheet_id, bounds), cell_format)
+            for bounds, cell_format in formats
+        ]
+
+        # --- Column widths, merges and row heights ---
+        requests.extend([
             # Column A width
             {
                 "updateDimensionProperties": {
@@ -1123,7 +1012,6 @@ class SheetsClient:
                     "fields": "pixelSize",
                 },
             },
-        ]
+        ])
 
-        self.spreadsheet.batch_update({"requests": requests})
-        logger.info("Applied column widths and merges")
+        return requests
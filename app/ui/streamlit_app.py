@@ -15,7 +15,7 @@ from typing import Optional
 from app.extraction.models import ComparisonSession, CarrierBundle, CurrentPolicy, InsuranceQuote, CoverageLimits
 from app.extraction.ai_extractor import extract_and_validate, extract_and_validate_multi
 from app.extraction.carrier_config import get_combined_sections, classify_policy_type
-from app.pdf_gen.generator import generate_comparison_pdf
+from app.pdf_gen.generator import render_comparison_pdf
 from app.sheets.sheets_client import SheetsClient
 
 logger = logging.getLogger(__name__)
@@ -52,7 +52,7 @@ def init_session_state() -> None:
 
         # ── Step 3: Export ──
         "agent_notes": "",
-        "export_pdf_path": None,
+        "export_pdf": None,  # (file_name, pdf_bytes)
         "export_sheet_url": None,
     }
 
@@ -809,7 +809,7 @@ def render_upload_stage() -> None:
             st.session_state.review_complete = False
             st.session_state.edited_bundles = []
             st.session_state.edited_current_policy = None
-            st.session_state.export_pdf_path = None
+            st.session_state.export_pdf = None
             st.session_state.export_sheet_url = None
 
             # Show success summary
@@ -1491,25 +1491,22 @@ def render_export_stage() -> None:
             try:
                 session = _build_comparison_session()
 
-                output_dir = Path("data/outputs")
-                output_dir.mkdir(parents=True, exist_ok=True)
-
                 safe_name = session.client_name.replace(" ", "_")
                 file_date = datetime.now().strftime("%Y-%m-%d")
-                output_path = str(output_dir / f"{safe_name}_comparison_{file_date}.pdf")
+                file_name = f"{safe_name}_comparison_{file_date}.pdf"
 
                 logo_path = "assets/logo_transparent.png"
                 if not Path(logo_path).exists():
                     logo_path = None
 
-                result_path = generate_comparison_pdf(
+                # Rendered in memory — the bytes go straight to the download button
+                pdf_bytes = render_comparison_pdf(
                     session=session,
-                    output_path=output_path,
                     logo_path=logo_path,
                     agent_notes=session.agent_notes,
                 )
 
-                st.session_state.export_pdf_path = result_path
+                st.session_state.export_pdf = (file_name, pdf_bytes)
                 st.success("PDF generated successfully!")
 
             except Exception as e:
@@ -1517,17 +1514,14 @@ def render_export_stage() -> None:
                 logger.error("PDF generation error", exc_info=True)
 
     # Show download button if PDF exists
-    if st.session_state.get("export_pdf_path"):
-        pdf_path = st.session_state.export_pdf_path
-        if Path(pdf_path).exists():
-            with open(pdf_path, "rb") as f:
-                pdf_bytes = f.read()
-            st.download_button(
-                label="Download PDF",
-                data=pdf_bytes,
-                file_name=Path(pdf_path).name,
-                mime="application/pdf",
-            )
+    if st.session_state.get("export_pdf"):
+        file_name, pdf_bytes = st.session_state.export_pdf
+        st.download_button(
+            label="Download PDF",
+            data=pdf_bytes,
+            file_name=file_name,
+            mime="application/pdf",
+        )
 
     st.markdown("---")
 
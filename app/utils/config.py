@@ -53,3 +53,7 @@ AGENCY_LICENSE: str = os.getenv("AGENCY_LICENSE", "")
 # --- App settings ---
 MAX_UPLOAD_FILES: int = int(os.getenv("MAX_UPLOAD_FILES", "6"))
 LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+
+# --- Persistent extraction cache (SQLite; empty path disables it) ---
+EXTRACTION_CACHE_PATH: str = os.getenv("EXTRACTION_CACHE_PATH", "")
+EXTRACTION_CACHE_TTL_DAYS: int = int(os.getenv("EXTRACTION_CACHE_TTL_DAYS", "30"))
@@ -27,7 +27,13 @@ from app.extraction.models import (
     CurrentPolicy,
     InsuranceQuote,
 )
-from app.pdf_gen.generator import generate_comparison_pdf, SciotoComparisonPDF
+from app.pdf_gen.generator import (
+    _HOME_ROWS,
+    _extract_home_row,
+    generate_comparison_pdf,
+    render_comparison_pdf,
+    SciotoComparisonPDF,
+)
 from app.sheets.sheets_client import SheetsClient
 
 
@@ -306,6 +312,30 @@ class TestPDFGeneration:
         assert Path(out).exists()
         assert Path(out).stat().st_size > 1024
 
+    def test_zero_home_deductibles_render_as_dash(self) -> None:
+        session = _make_cloud_session()
+        home = session.carriers[0].home.model_copy(
+            update={"deductible": 0.0, "wind_hail_deductible": 0.0}
+        )
+        carriers = [CarrierBundle(carrier_name="Erie Insurance", home=home)]
+        for label, quote_get, current_get, _ in _HOME_ROWS:
+            if label in ("All-Peril Deductible", "Wind/Hail Deductible"):
+                values = _extract_home_row(quote_get, current_get, None, carriers)
+                assert values == ["-"], label
+
+    def test_render_returns_bytes_without_writing(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        # Any relative-path write would land in tmp_path
+        monkeypatch.chdir(tmp_path)
+        session = _make_cloud_session()
+        with patch.object(Path, "write_bytes") as write_bytes:
+            pdf_bytes = render_comparison_pdf(session, date_str="January 1, 2026")
+        assert pdf_bytes.startswith(b"%PDF-")
+        assert len(pdf_bytes) > 1024
+        write_bytes.assert_not_called()
+        assert not list(tmp_path.iterdir())
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 4. Sheets Grid Build — grid building without Google API
@@ -365,9 +395,141 @@ class TestSheetsGridBuild:
         client = self._make_client()
         session = _make_cloud_session()
         num_data_cols = client._get_num_data_columns(session)
-        grid, _ = client._build_full_grid(session, num_data_cols)
-        # grid[0][1] is the title cell (B1)
-        assert "Test Client" in grid[0][1]
+        rows, _ = client._build_full_grid(session, num_data_cols)
+        # rows[0] values[1] is the title cell (B1)
+        title = rows[0]["values"][1]["userEnteredValue"]["stringValue"]
+        assert "Test Client" in title
+
+    def test_carrier_matrix_has_one_value_per_carrier(self) -> None:
+        client = self._make_client()
+        session = _make_cloud_session()
+        matrix = client._extract_carrier_matrix(session)
+        assert len(matrix["total_premium"]) == len(session.carriers)
+        assert matrix["home_2_dwelling"] == ["-"] * len(session.carriers)
+
+    def test_single_batch_requests_target_new_sheet(self) -> None:
+        client = self._make_client()
+        session = _make_cloud_session()
+        num_data_cols = client._get_num_data_columns(session)
+        rows, config = client._build_full_grid(session, num_data_cols)
+        values = client._build_values_request(42, rows)["updateCells"]
+        assert values["start"]["sheetId"] == 42
+        assert len(values["rows"]) == config.total_rows
+        # Blank separator rows carry no cells at all
+        assert {"values": []} in values["rows"]
+        requests = client._build_format_requests(42, num_data_cols, config)
+        repeat_cells = [r["repeatCell"] for r in requests if "repeatCell" in r]
+        assert repeat_cells
+        assert all(r["range"]["sheetId"] == 42 for r in repeat_cells)
+
+
+class TestSheetsSharedClient:
+    """Shared gspread connection and worksheet title cache, with auth mocked."""
+
+    BASE_NAME = "Quote_Test Client_2026-01-01"
+
+    def setup_method(self) -> None:
+        self._reset_shared_state()
+
+    def teardown_method(self) -> None:
+        self._reset_shared_state()
+
+    @staticmethod
+    def _reset_shared_state() -> None:
+        SheetsClient._gc = None
+        SheetsClient._spreadsheet = None
+        SheetsClient._known_titles = set()
+
+    def _make_client(self, titles: set[str]) -> SheetsClient:
+        """Create a SheetsClient whose auth and title fetch are mocked."""
+        with patch("gspread.service_account"), patch(
+            "app.sheets.sheets_client._fetch_titles", return_value=set(titles)
+        ):
+            return SheetsClient()
+
+    def test_instances_authenticate_once(self) -> None:
+        with patch("gspread.service_account") as mock_auth, patch(
+            "app.sheets.sheets_client._fetch_titles", return_value=set()
+        ) as mock_fetch:
+            first = SheetsClient()
+            second = SheetsClient()
+        mock_auth.assert_called_once()
+        mock_fetch.assert_called_once()
+        assert first.spreadsheet is second.spreadsheet
+
+    @staticmethod
+    def _batch_titles(client: SheetsClient) -> list[str]:
+        """Titles sent in each batch_update's leading addSheet request."""
+        return [
+            call.args[0]["requests"][0]["addSheet"]["properties"]["title"]
+            for call in client.spreadsheet.batch_update.call_args_list
+        ]
+
+    def test_add_sheet_and_content_share_one_batch(self) -> None:
+        client = self._make_client(set())
+        content = [{"updateCells": {"start": {"sheetId": 7}}}]
+        client._create_worksheet("Test Client", "2026-01-01", 2, 7, content)
+        client.spreadsheet.batch_update.assert_called_once()
+        client.spreadsheet.add_worksheet.assert_not_called()
+        requests = client.spreadsheet.batch_update.call_args.args[0]["requests"]
+        properties = requests[0]["addSheet"]["properties"]
+        assert properties["sheetId"] == 7
+        assert properties["gridProperties"] == {"rowCount": 25, "columnCount": 3}
+        assert requests[1:] == content
+
+    def test_duplicate_base_name_gets_suffix(self) -> None:
+        client = self._make_client({self.BASE_NAME})
+        client._create_worksheet("Test Client", "2026-01-01", 2, 1, [])
+        client._create_worksheet("Test Client", "2026-01-01", 2, 2, [])
+        titles = self._batch_titles(client)
+        assert titles == [f"{self.BASE_NAME}_2", f"{self.BASE_NAME}_3"]
+        assert {f"{self.BASE_NAME}_2", f"{self.BASE_NAME}_3"} <= SheetsClient._known_titles
+
+    @staticmethod
+    def _api_error(message: str) -> Exception:
+        """Build a gspread 400 APIError carrying message."""
+        from gspread.exceptions import APIError
+
+        response = MagicMock()
+        response.status_code = 400
+        response.json.return_value = {
+            "error": {"code": 400, "message": message, "status": "INVALID_ARGUMENT"}
+        }
+        return APIError(response)
+
+    def test_failed_add_releases_reserved_name(self) -> None:
+        from gspread.exceptions import APIError
+
+        client = self._make_client(set())
+        client.spreadsheet.batch_update.side_effect = self._api_error("bad request")
+        with pytest.raises(APIError):
+            client._create_worksheet("Test Client", "2026-01-01", 2, 1, [])
+        client.spreadsheet.batch_update.assert_called_once()
+        assert self.BASE_NAME not in SheetsClient._known_titles
+
+    def test_duplicate_title_refreshes_cache_and_retries(self) -> None:
+        client = self._make_client(set())
+        client.spreadsheet.batch_update.side_effect = [
+            self._api_error(
+                f'Invalid requests[0].addSheet: A sheet with the name '
+                f'"{self.BASE_NAME}" already exists. Please enter another name.'
+            ),
+            None,
+        ]
+        with patch(
+            "app.sheets.sheets_client._fetch_titles", return_value={self.BASE_NAME}
+        ) as mock_fetch:
+            title = client._create_worksheet("Test Client", "2026-01-01", 2, 1, [])
+        mock_fetch.assert_called_once()
+        assert title == f"{self.BASE_NAME}_2"
+        assert self._batch_titles(client) == [self.BASE_NAME, f"{self.BASE_NAME}_2"]
+        assert SheetsClient._known_titles == {self.BASE_NAME, f"{self.BASE_NAME}_2"}
+
+    def test_refresh_titles_replaces_cache(self) -> None:
+        client = self._make_client({"Old Tab"})
+        with patch("app.sheets.sheets_client._fetch_titles", return_value={"New Tab"}):
+            client.refresh_titles()
+        assert SheetsClient._known_titles == {"New Tab"}
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -196,7 +196,7 @@ class TestMultiQuoteExtractionResult:
         )
         assert result.success is True
         assert len(result.quotes) == 1
-        assert len(result.warnings) == 1
+        assert result.warnings == ("minor warning",)
 
     def test_failure_result(self) -> None:
         result = MultiQuoteExtractionResult(
@@ -207,6 +207,7 @@ class TestMultiQuoteExtractionResult:
         assert result.success is False
         assert len(result.quotes) == 0
         assert result.error == "Something went wrong"
+        assert result.warnings == ()
 
 
 # ---------------------------------------------------------------------------
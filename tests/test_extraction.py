@@ -0,0 +1,516 @@
+"""Tests for the single-quote extraction pipeline in ai_extractor."""
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.extraction.models import (
+    InsuranceQuote,
+    MultiQuoteExtractionResult,
+    QuoteExtractionResult,
+)
+
+
+def _make_quote(**overrides: object) -> dict:
+    """Build a minimal InsuranceQuote dict with defaults."""
+    base = {
+        "carrier_name": "Test Carrier",
+        "policy_type": "HO3",
+        "annual_premium": 1200.0,
+        "deductible": 1000.0,
+        "confidence": "high",
+    }
+    base.update(overrides)
+    return base
+
+
+# ---------------------------------------------------------------------------
+# ai_extractor: batch entry points
+# ---------------------------------------------------------------------------
+
+
+class TestExtractAndValidateBatch:
+    @patch("app.extraction.ai_extractor.extract_and_validate")
+    def test_results_in_input_order(self, mock_extract: MagicMock) -> None:
+        from app.extraction.ai_extractor import extract_and_validate_batch
+
+        mock_extract.side_effect = lambda pdf, filename, carrier: QuoteExtractionResult(
+            filename=filename,
+            success=True,
+            quote=InsuranceQuote(**_make_quote(carrier_name=carrier)),
+        )
+
+        items = [(b"pdf-%d" % i, f"file{i}.pdf", f"Carrier {i}") for i in range(6)]
+        results = extract_and_validate_batch(items, max_workers=3)
+
+        assert [r.filename for r in results] == [f"file{i}.pdf" for i in range(6)]
+        assert [r.quote.carrier_name for r in results] == [f"Carrier {i}" for i in range(6)]
+        assert mock_extract.call_count == 6
+
+    @patch("app.extraction.ai_extractor.extract_and_validate_multi")
+    def test_multi_batch_passes_expected_types(self, mock_extract: MagicMock) -> None:
+        from app.extraction.ai_extractor import extract_and_validate_multi_batch
+
+        mock_extract.return_value = MultiQuoteExtractionResult(
+            filename="combined.pdf", success=True,
+        )
+
+        extract_and_validate_multi_batch(
+            [(b"pdf", "combined.pdf", "Grange", ["home", "umbrella"])]
+        )
+
+        mock_extract.assert_called_once_with(
+            b"pdf", "combined.pdf", "Grange", ["home", "umbrella"],
+        )
+
+    def test_empty_batch(self) -> None:
+        from app.extraction.ai_extractor import extract_and_validate_batch
+
+        assert extract_and_validate_batch([]) == []
+
+
+# ---------------------------------------------------------------------------
+# ai_extractor: extraction result cache
+# ---------------------------------------------------------------------------
+
+
+class TestExtractionCache:
+    def setup_method(self) -> None:
+        from app.extraction.ai_extractor import clear_extraction_cache
+
+        clear_extraction_cache()
+
+    def teardown_method(self) -> None:
+        from app.extraction.ai_extractor import clear_extraction_cache
+
+        clear_extraction_cache()
+
+    @patch("app.extraction.ai_extractor._call_gemini_text")
+    @patch("app.extraction.ai_extractor.extract_text_from_pdf")
+    def test_same_pdf_hits_cache(
+        self, mock_pdf: MagicMock, mock_gemini: MagicMock
+    ) -> None:
+        from app.extraction.ai_extractor import extract_quote_data
+
+        mock_pdf.return_value = ("fake markdown text", True)
+        mock_gemini.return_value = InsuranceQuote(**_make_quote())
+
+        first = extract_quote_data(b"same-pdf", "a.pdf", carrier_name="Erie")
+        second = extract_quote_data(b"same-pdf", "b.pdf", carrier_name="Erie")
+
+        assert mock_gemini.call_count == 1
+        assert second == first
+        assert second is not first
+
+    @patch("app.extraction.ai_extractor._call_gemini_text")
+    @patch("app.extraction.ai_extractor.extract_text_from_pdf")
+    def test_different_carrier_misses_cache(
+        self, mock_pdf: MagicMock, mock_gemini: MagicMock
+    ) -> None:
+        from app.extraction.ai_extractor import extract_quote_data
+
+        mock_pdf.return_value = ("fake markdown text", True)
+        mock_gemini.return_value = InsuranceQuote(**_make_quote())
+
+        extract_quote_data(b"same-pdf", "a.pdf", carrier_name="Erie")
+        extract_quote_data(b"same-pdf", "a.pdf", carrier_name="Safeco")
+
+        assert mock_gemini.call_count == 2
+
+    @patch("app.extraction.ai_extractor._call_gemini_text")
+    @patch("app.extraction.ai_extractor.extract_text_from_pdf")
+    def test_cached_copy_is_isolated(
+        self, mock_pdf: MagicMock, mock_gemini: MagicMock
+    ) -> None:
+        from app.extraction.ai_extractor import extract_quote_data
+
+        mock_pdf.return_value = ("fake markdown text", True)
+        mock_gemini.return_value = InsuranceQuote(**_make_quote())
+
+        first = extract_quote_data(b"same-pdf", "a.pdf")
+        first.coverage_limits.dwelling = 1.0
+        second = extract_quote_data(b"same-pdf", "a.pdf")
+
+        assert second.coverage_limits.dwelling is None
+
+    def test_list_fields_default_to_shared_empty_tuple(self) -> None:
+        first = InsuranceQuote(**_make_quote())
+        second = InsuranceQuote(**_make_quote(endorsements=["Water Backup"]))
+
+        assert first.endorsements == ()
+        assert first.exclusions is InsuranceQuote(**_make_quote()).exclusions
+        assert second.endorsements == ("Water Backup",)
+
+
+# ---------------------------------------------------------------------------
+# ai_extractor: multi-quote short-circuit
+# ---------------------------------------------------------------------------
+
+
+class TestMultiSingleTypeShortCircuit:
+    @patch("app.extraction.ai_extractor._call_gemini_text_multi")
+    @patch("app.extraction.ai_extractor.extract_quote_data")
+    def test_single_expected_type_uses_single_path(
+        self, mock_single: MagicMock, mock_multi: MagicMock
+    ) -> None:
+        from app.extraction.ai_extractor import extract_multi_quote_data
+
+        mock_single.return_value = InsuranceQuote(**_make_quote())
+
+        quotes = extract_multi_quote_data(
+            b"pdf", "home.pdf", carrier_name="Grange",
+            expected_policy_types=["home"],
+        )
+
+        assert len(quotes) == 1
+        mock_single.assert_called_once_with(b"pdf", "home.pdf", "Grange")
+        mock_multi.assert_not_called()
+
+    @patch("app.extraction.ai_extractor._call_gemini_text_multi")
+    @patch("app.extraction.ai_extractor.extract_quote_data")
+    def test_no_expected_types_uses_single_path(
+        self, mock_single: MagicMock, mock_multi: MagicMock
+    ) -> None:
+        from app.extraction.ai_extractor import extract_multi_quote_data
+
+        mock_single.return_value = InsuranceQuote(**_make_quote())
+
+        quotes = extract_multi_quote_data(b"pdf", "home.pdf")
+
+        assert len(quotes) == 1
+        mock_multi.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# ai_extractor: model selection
+# ---------------------------------------------------------------------------
+
+
+class TestModelSelection:
+    def setup_method(self) -> None:
+        from app.extraction.ai_extractor import clear_extraction_cache
+
+        clear_extraction_cache()
+
+    @patch("app.extraction.ai_extractor._call_gemini_text")
+    @patch("app.extraction.ai_extractor.extract_text_from_pdf")
+    def test_text_path_falls_back_to_full_model(
+        self, mock_pdf: MagicMock, mock_gemini: MagicMock
+    ) -> None:
+        from app.extraction.ai_extractor import (
+            MULTIMODAL_MODEL_NAME,
+            extract_quote_data,
+        )
+
+        mock_pdf.return_value = ("fake markdown text", True)
+        mock_gemini.side_effect = [
+            ValueError("JSON parse failed even after repair"),
+            InsuranceQuote(**_make_quote()),
+        ]
+
+        quote = extract_quote_data(b"fallback-pdf", "test.pdf")
+
+        assert quote.raw_source == "text"
+        assert mock_gemini.call_count == 2
+        assert len(mock_gemini.call_args_list[0][0]) == 2
+        assert mock_gemini.call_args_list[1][0][2] == MULTIMODAL_MODEL_NAME
+
+
+# ---------------------------------------------------------------------------
+# ai_extractor: carrier lookup
+# ---------------------------------------------------------------------------
+
+
+class TestGetCarrierKey:
+    def test_case_insensitive_substring(self) -> None:
+        from app.extraction.ai_extractor import get_carrier_key
+
+        assert get_carrier_key("STATE FARM Fire & Casualty") == "state farm"
+        assert get_carrier_key("Erie Insurance Group") == "erie"
+
+    def test_unknown_carrier_is_default(self) -> None:
+        from app.extraction.ai_extractor import get_carrier_key
+
+        assert get_carrier_key("Acme Mutual") == "default"
+        assert get_carrier_key("") == "default"
+
+
+# ---------------------------------------------------------------------------
+# ai_extractor: _parse_multi_response
+# ---------------------------------------------------------------------------
+
+
+class TestParseMultiResponse:
+    def test_parsed_list_validated(self) -> None:
+        from app.extraction.ai_extractor import _parse_multi_response
+
+        response = MagicMock(
+            parsed=[_make_quote(policy_type="HO3"), _make_quote(policy_type="Umbrella")]
+        )
+
+        quotes = _parse_multi_response(response)
+
+        assert [q.policy_type for q in quotes] == ["HO3", "Umbrella"]
+        assert all(isinstance(q, InsuranceQuote) for q in quotes)
+
+    def test_empty_text_reports_prompt_feedback(self) -> None:
+        from app.extraction.ai_extractor import _parse_multi_response
+
+        response = MagicMock(parsed=None, text=None, prompt_feedback="SAFETY")
+
+        with pytest.raises(ValueError, match="prompt_feedback=SAFETY"):
+            _parse_multi_response(response)
+
+    def test_parsed_wrapper_instance_returns_quotes(self) -> None:
+        from app.extraction.ai_extractor import _parse_multi_response
+        from app.extraction.models import MultiQuoteResponse
+
+        wrapper = MultiQuoteResponse(quotes=[InsuranceQuote(**_make_quote())])
+        response = MagicMock(parsed=wrapper)
+
+        assert _parse_multi_response(response) is wrapper.quotes
+
+
+# ---------------------------------------------------------------------------
+# ai_extractor: in-flight request coalescing
+# ---------------------------------------------------------------------------
+
+
+class TestSingleFlight:
+    def setup_method(self) -> None:
+        from app.extraction.ai_extractor import clear_extraction_cache
+
+        clear_extraction_cache()
+
+    @patch("app.extraction.ai_extractor._call_gemini_text")
+    @patch("app.extraction.ai_extractor.extract_text_from_pdf")
+    def test_concurrent_identical_requests_call_gemini_once(
+        self, mock_pdf: MagicMock, mock_gemini: MagicMock
+    ) -> None:
+        import threading
+        import time
+
+        from app.extraction.ai_extractor import extract_quote_data
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_gemini(*args: object) -> InsuranceQuote:
+            started.set()
+            release.wait(timeout=5)
+            return InsuranceQuote(**_make_quote())
+
+        mock_pdf.return_value = ("fake markdown text", True)
+        mock_gemini.side_effect = slow_gemini
+
+        results: list[InsuranceQuote] = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(extract_quote_data(b"dup-pdf", "a.pdf"))
+            )
+            for _ in range(2)
+        ]
+        threads[0].start()
+        started.wait(timeout=5)
+        threads[1].start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert mock_gemini.call_count == 1
+        assert len(results) == 2
+        assert results[0] is not results[1]
+
+    def test_owner_exception_propagates_to_waiters(self) -> None:
+        from app.extraction.ai_extractor import _inflight, _single_flight
+
+        with pytest.raises(RuntimeError, match="boom"):
+            _single_flight((b"k", "", (), False), MagicMock(side_effect=RuntimeError("boom")))
+        assert _inflight == {}
+
+
+# ---------------------------------------------------------------------------
+# result_store: persistent extraction cache
+# ---------------------------------------------------------------------------
+
+
+class TestExtractionStore:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        from app.extraction.result_store import ExtractionStore
+
+        store = ExtractionStore(str(tmp_path / "cache" / "extractions.db"), ttl_seconds=60)
+        store.put("key", '{"carrier_name": "Erie"}')
+
+        assert store.get("key") == '{"carrier_name": "Erie"}'
+        assert store.get("missing") is None
+
+    def test_expired_entry_is_miss(self, tmp_path: Path) -> None:
+        from app.extraction.result_store import ExtractionStore
+
+        store = ExtractionStore(str(tmp_path / "extractions.db"), ttl_seconds=-1)
+        store.put("key", "{}")
+
+        assert store.get("key") is None
+
+    def test_clear(self, tmp_path: Path) -> None:
+        from app.extraction.result_store import ExtractionStore
+
+        store = ExtractionStore(str(tmp_path / "extractions.db"), ttl_seconds=60)
+        store.put("key", "{}")
+        store.clear()
+
+        assert store.get("key") is None
+
+    def test_expired_rows_deleted_on_open(self, tmp_path: Path) -> None:
+        from app.extraction.result_store import ExtractionStore
+
+        path = str(tmp_path / "extractions.db")
+        ExtractionStore(path, ttl_seconds=60).put("key", "{}")
+        store = ExtractionStore(path, ttl_seconds=-1)
+
+        count = store._conn.execute("SELECT COUNT(*) FROM extractions").fetchone()[0]
+        assert count == 0
+
+    def test_open_falls_back_to_none_for_bad_paths(self, tmp_path: Path) -> None:
+        from app.extraction.result_store import open_extraction_store
+
+        corrupt = tmp_path / "corrupt.db"
+        corrupt.write_bytes(b"not a sqlite database" * 100)
+        blocker = tmp_path / "blocker"
+        blocker.write_text("a file where a directory should be")
+
+        assert open_extraction_store(str(corrupt), ttl_seconds=60) is None
+        assert open_extraction_store(str(blocker / "extractions.db"), ttl_seconds=60) is None
+
+
+# ---------------------------------------------------------------------------
+# ai_extractor: _clean_schema_for_gemini
+# ---------------------------------------------------------------------------
+
+
+class TestCleanSchema:
+    def test_strips_unsupported_keys_at_every_depth(self) -> None:
+        from app.extraction.ai_extractor import _clean_schema_for_gemini
+
+        schema = {
+            "title": "Quote",
+            "properties": {
+                "notes": {"anyOf": [{"type": "string", "title": "S"}], "default": None},
+            },
+            "$defs": {"Limits": {"title": "Limits", "additionalProperties": False}},
+        }
+
+        cleaned = _clean_schema_for_gemini(schema)
+
+        assert cleaned == {
+            "properties": {"notes": {"anyOf": [{"type": "string"}]}},
+            "$defs": {"Limits": {}},
+        }
+
+    def test_field_named_like_keyword_is_kept(self) -> None:
+        from app.extraction.ai_extractor import _clean_schema_for_gemini
+
+        schema = {"properties": {"title": {"type": "string", "title": "Title"}}}
+
+        assert _clean_schema_for_gemini(schema) == {
+            "properties": {"title": {"type": "string"}}
+        }
+
+
+class TestExtractAndValidateMany:
+    @patch("app.extraction.ai_extractor.extract_and_validate")
+    def test_results_in_input_order(self, mock_extract: MagicMock) -> None:
+        import asyncio
+
+        from app.extraction.ai_extractor import extract_and_validate_many
+
+        mock_extract.side_effect = lambda pdf, filename, carrier: QuoteExtractionResult(
+            filename=filename, success=True,
+        )
+
+        items = [(b"pdf-%d" % i, f"file{i}.pdf", "") for i in range(5)]
+        results = asyncio.run(extract_and_validate_many(items, max_concurrency=2))
+
+        assert [r.filename for r in results] == [f"file{i}.pdf" for i in range(5)]
+
+
+# ---------------------------------------------------------------------------
+# ai_extractor: _parse_response
+# ---------------------------------------------------------------------------
+
+
+class TestParseResponse:
+    def test_valid_json(self) -> None:
+        import json
+
+        from app.extraction.ai_extractor import _parse_response
+
+        quote = _parse_response(json.dumps(_make_quote(carrier_name="Erie")))
+        assert quote.carrier_name == "Erie"
+
+    def test_malformed_json_is_repaired(self) -> None:
+        import json
+
+        from app.extraction.ai_extractor import _parse_response
+
+        truncated = json.dumps(_make_quote(carrier_name="Erie"))[:-1] + ","
+        quote = _parse_response(truncated)
+        assert quote.carrier_name == "Erie"
+
+    def test_schema_error_is_not_repaired(self) -> None:
+        import json
+
+        from pydantic import ValidationError
+
+        from app.extraction.ai_extractor import _parse_response
+
+        with pytest.raises(ValidationError):
+            _parse_response(json.dumps({"carrier_name": "Erie"}))
+
+
+# ---------------------------------------------------------------------------
+# pdf_parser: text cache
+# ---------------------------------------------------------------------------
+
+
+class TestPdfTextCache:
+    def setup_method(self) -> None:
+        from app.extraction import pdf_parser
+
+        pdf_parser._text_cache.clear()
+
+    @patch("app.extraction.pdf_parser._parse_pdf")
+    def test_same_bytes_parsed_once(self, mock_parse: MagicMock) -> None:
+        from app.extraction.pdf_parser import extract_text_from_pdf
+
+        mock_parse.return_value = ("# Quote", True)
+
+        assert extract_text_from_pdf(b"same-pdf") == ("# Quote", True)
+        assert extract_text_from_pdf(b"same-pdf") == ("# Quote", True)
+        assert mock_parse.call_count == 1
+
+    @patch("app.extraction.pdf_parser._parse_pdf")
+    def test_parse_errors_not_cached(self, mock_parse: MagicMock) -> None:
+        from app.extraction.pdf_parser import extract_text_from_pdf
+
+        mock_parse.side_effect = [RuntimeError("corrupt"), ("# Quote", True)]
+
+        assert extract_text_from_pdf(b"flaky-pdf") == ("", False)
+        assert extract_text_from_pdf(b"flaky-pdf") == ("# Quote", True)
+
+    def test_scan_detected_from_sampled_pages(self) -> None:
+        from app.extraction.pdf_parser import _looks_scanned
+
+        pages = [MagicMock() for _ in range(10)]
+        for page in pages:
+            page.get_text.return_value = ""
+        doc = MagicMock(page_count=10)
+        doc.__getitem__.side_effect = pages.__getitem__
+
+        assert _looks_scanned(doc) is True
+        assert [i for i, page in enumerate(pages) if page.get_text.called] == [0, 5, 9]
+
+        pages[5].get_text.return_value = "Declarations Page " * 10
+        assert _looks_scanned(doc) is False
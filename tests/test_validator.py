@@ -0,0 +1,75 @@
+"""Tests for validate_quote in app.extraction.validator."""
+
+from app.extraction.models import InsuranceQuote
+from app.extraction.validator import validate_quote
+
+
+def _make_quote(**overrides: object) -> InsuranceQuote:
+    """Build a minimal valid InsuranceQuote."""
+    base = {
+        "carrier_name": "Test Carrier",
+        "policy_type": "HO3",
+        "annual_premium": 1200.0,
+        "deductible": 1000.0,
+        "confidence": "high",
+    }
+    base.update(overrides)
+    return InsuranceQuote(**base)
+
+
+# ---------------------------------------------------------------------------
+# validator: effective date format
+# ---------------------------------------------------------------------------
+
+
+class TestEffectiveDate:
+    def test_iso_date_passes(self) -> None:
+        _, warnings = validate_quote(_make_quote(effective_date="2025-03-01"))
+        assert warnings == []
+
+    def test_wrong_shape_warns(self) -> None:
+        _, warnings = validate_quote(_make_quote(effective_date="03/01/2025"))
+        assert warnings == ["Invalid effective date format: '03/01/2025'"]
+
+    def test_impossible_date_warns(self) -> None:
+        _, warnings = validate_quote(_make_quote(effective_date="2025-02-30"))
+        assert warnings == ["Invalid effective date format: '2025-02-30'"]
+
+
+# ---------------------------------------------------------------------------
+# validator: coverage limits
+# ---------------------------------------------------------------------------
+
+
+class TestCoverageLimits:
+    def test_only_non_positive_limits_warn(self) -> None:
+        quote = _make_quote(
+            coverage_limits={"dwelling": 300000.0, "other_structures": 0.0, "csl": -5.0},
+        )
+
+        _, warnings = validate_quote(quote)
+
+        assert warnings == [
+            "Coverage limit 'other_structures' is non-positive: 0.0",
+            "Coverage limit 'csl' is non-positive: -5.0",
+        ]
+
+
+# ---------------------------------------------------------------------------
+# models: confidence
+# ---------------------------------------------------------------------------
+
+
+class TestConfidence:
+    def test_case_normalized(self) -> None:
+        assert _make_quote(confidence=" High ").confidence == "high"
+
+    def test_case_normalized_without_warning(self) -> None:
+        _, warnings = validate_quote(_make_quote(confidence="MEDIUM"))
+        assert warnings == []
+
+    def test_unknown_defaults_to_low_with_warning(self) -> None:
+        quote, warnings = validate_quote(_make_quote(confidence="certain"))
+
+        assert quote.confidence == "low"
+        assert warnings == ["Invalid confidence 'certain', defaulted to 'low'"]